@@ -2,12 +2,14 @@ from PIL import Image
 import os
 import sys
 import glob
+import mmap
 import time 
 import textwrap
 import tempfile
 import numpy as np
 import tkinter as tk
 from tkinter import messagebox 
+from concurrent.futures import ThreadPoolExecutor
 
 # --- VTF Tools Path Detection ---
 # VTF tools should be bundled with the application
@@ -230,6 +232,30 @@ HL2_TF2_DOME_TRANSFORMS = {
     'back':    ('left', 0, None),
 }
 
+# Transform configs flattened into lists parallel to TARGET_SLOTS (no per-slot dict lookups)
+SLOT_TRANSFORMS = {
+    name: [transform_map.get(slot, (slot, 0, None)) for slot in TARGET_SLOTS]
+    for name, transform_map in (
+        ("DEFAULT_TRANSFORMS", DEFAULT_TRANSFORMS),
+        ("EXR_TRANSFORMS", EXR_TRANSFORMS),
+        ("HL2_TF2_DOME_TRANSFORMS", HL2_TF2_DOME_TRANSFORMS),
+    )
+}
+
+# (column, row) of each TARGET_SLOTS entry in the final 4x3 image, in face-size units
+SLOT_GRID_POSITIONS = [(1, 0), (0, 1), (1, 1), (2, 1), (3, 1), (1, 2)]
+
+# NumPy equivalents of the PIL transpose constants used in the configs above
+NUMPY_TRANSPOSES = {
+    Image.Transpose.FLIP_LEFT_RIGHT: lambda a: a[:, ::-1],
+    Image.Transpose.FLIP_TOP_BOTTOM: lambda a: a[::-1],
+    Image.Transpose.ROTATE_90: lambda a: np.rot90(a, 1),
+    Image.Transpose.ROTATE_180: lambda a: np.rot90(a, 2),
+    Image.Transpose.ROTATE_270: lambda a: np.rot90(a, 3),
+    Image.Transpose.TRANSPOSE: lambda a: a.swapaxes(0, 1),
+    Image.Transpose.TRANSVERSE: lambda a: np.rot90(a, 2).swapaxes(0, 1),
+}
+
 # --- VMAT TEMPLATE (LDR Only) ---
 def get_ldr_vmat_content(sky_texture_path):
     """Generates the VMAT content with the correct dynamic texture path."""
@@ -312,6 +338,11 @@ Layer0
 }}"""
 # --------------------
 
+# Pre-encoded VMAT templates - only the texture path is substituted per write
+VMAT_TEXTURE_PLACEHOLDER = b"__SKY_TEXTURE_PATH__"
+SKYBOX_VMAT_TEMPLATE = get_ldr_vmat_content(VMAT_TEXTURE_PLACEHOLDER.decode()).encode('utf-8')
+MOONDOME_VMAT_TEMPLATE = get_moondome_vmat_content(VMAT_TEXTURE_PLACEHOLDER.decode()).encode('utf-8')
+
 def convert_exr_to_png(input_file, output_file):
     """
     Converts a single EXR file to a temporary LDR PNG file using openexr-numpy and PIL.
@@ -339,7 +370,8 @@ def convert_exr_to_png(input_file, output_file):
 
         # Use Pillow to save the 8-bit NumPy array as a PNG
         pil_image = Image.fromarray(image_8bit, 'RGBA')
-        pil_image.save(output_file, format='PNG')
+        # Temporary file - fastest zlib level, it is only read back once
+        pil_image.save(output_file, format='PNG', compress_level=1)
         
         return True
     
@@ -418,19 +450,36 @@ def determine_skybox_prefix(filenames_map):
             
     return final_prefix
 
+# Filename keywords identifying each cubemap face (matched at the end of the name)
+FACE_KEYWORDS = {
+    'right':['right', 'rt', 'px'],
+    'left': ['left', 'lf', 'nx'],
+    'back': ['back', 'bk', 'py'],
+    'front':['front', 'ft', 'ny'],
+    'up':   ['up', 'top', 'pz'],
+    'down': ['down', 'dn', 'nz'],
+}
+# Inverted index (keyword -> face) and the keyword lengths to try, longest first
+KEYWORD_TO_FACE = {keyword: face for face, keywords in FACE_KEYWORDS.items() for keyword in keywords}
+KEYWORD_LENGTHS = sorted({len(keyword) for keyword in KEYWORD_TO_FACE}, reverse=True)
+
+def match_face_keyword(name_no_ext):
+    """
+    Returns (face, keyword) for the face keyword the name ends with (or is),
+    or (None, None). Longest keywords win, so 'skyleft' is left, not front ('ft').
+    """
+    for length in KEYWORD_LENGTHS:
+        keyword = name_no_ext[-length:]
+        face = KEYWORD_TO_FACE.get(keyword)
+        if face:
+            return face, keyword
+    return None, None
+
 def find_cubemap_files(directory="."):
     """
     Scans the specified directory for files matching the cubemap face keywords.
     Prints the names of any missing required face images.
     """
-    FACE_KEYWORDS = {
-        'right':['right', 'rt', 'px'],
-        'left': ['left', 'lf', 'nx'],
-        'back': ['back', 'bk', 'py'],
-        'front':['front', 'ft', 'ny'],
-        'up':   ['up', 'top', 'pz'],     
-        'down': ['down', 'dn', 'nz'],    
-    }
     REQUIRED_FACES = set(FACE_KEYWORDS.keys())
     IMAGE_EXTENSIONS = ('.vtf', '.png', '.jpg', '.jpeg', '.tga', '.exr') 
     VMT_EXTENSION = ('.vmt',)
@@ -444,42 +493,27 @@ def find_cubemap_files(directory="."):
     print(f"Found {len(target_files)} potential image/vtf files in the directory.")
     print(f"Files: {[os.path.basename(f) for f in target_files]}")
     
+    # Single pass over the image files in extension priority order - first match per face wins
+    for ext in IMAGE_EXTENSIONS:
+        for fpath in target_files:
+            if not fpath.lower().endswith(ext):
+                continue
+            name_no_ext = os.path.splitext(os.path.basename(fpath).lower())[0]
+            face_name, keyword = match_face_keyword(name_no_ext)
+            if face_name and face_name not in found_files:
+                found_files[face_name] = fpath
+                print(f"  [OK] MATCHED! Found file for '{face_name}': {os.path.basename(fpath)} (matched keyword: '{keyword}')")
+
+    # VMT check is kept for error reporting, but not used in stitching
     for face_name, keywords in FACE_KEYWORDS.items():
-        found = False
-        print(f"\nSearching for face '{face_name}' with keywords: {keywords}")
-        
-        # Check for IMAGE files first
-        for ext in IMAGE_EXTENSIONS:
-            if found: break
-            for fpath in target_files:
-                if fpath.lower().endswith(ext):
-                    # Check for "skybox" or a similar prefix followed by a keyword
-                    fname_lower = os.path.basename(fpath).lower()
-                    name_no_ext = os.path.splitext(fname_lower)[0]
-                    
-                    print(f"  Checking file: {os.path.basename(fpath)} (name without ext: '{name_no_ext}')")
-                    
-                    # Check if any keyword matches
-                    for keyword in keywords:
-                        # Match if keyword is at the end of filename OR is the entire filename
-                        if name_no_ext.endswith(keyword) or name_no_ext == keyword:
-                            found_files[face_name] = fpath
-                            found = True
-                            print(f"    [OK] MATCHED! Found file for '{face_name}': {os.path.basename(fpath)} (matched keyword: '{keyword}')")
-                            break
-                        else:
-                            print(f"    - No match for keyword '{keyword}' (endswith: {name_no_ext.endswith(keyword)}, equals: {name_no_ext == keyword})")
-                    
-                    if found: break
-        
-        # VMT check is kept for error reporting, but not used in stitching
-        if not found:
-             for fpath in target_files:
-                 if fpath.lower().endswith(VMT_EXTENSION):
-                     fname_lower = os.path.basename(fpath).lower()
-                     if any(keyword in fname_lower for keyword in keywords):
-                         print(f"ERROR: Found file for '{face_name}' but it is a VMT file: {os.path.basename(fpath)}. An image file (.vtf/.png/etc.) is required.")
-                         break
+        if face_name in found_files:
+            continue
+        for fpath in target_files:
+            if fpath.lower().endswith(VMT_EXTENSION):
+                fname_lower = os.path.basename(fpath).lower()
+                if any(keyword in fname_lower for keyword in keywords):
+                    print(f"ERROR: Found file for '{face_name}' but it is a VMT file: {os.path.basename(fpath)}. An image file (.vtf/.png/etc.) is required.")
+                    break
 
     valid_faces = set(found_files.keys())
     missing_faces = REQUIRED_FACES - valid_faces
@@ -591,37 +625,41 @@ def convert_vtf_to_png(vtf_path, output_dir):
 
 def generate_vmat_content_and_save(vmat_path, content, material_type):
     """
-    Generates and writes the specified .vmat file content.
+    Writes the specified pre-encoded .vmat file content. Returns True on success.
     """
     print(f"Creating {material_type} VMAT...")
     
     try:
-        with open(vmat_path, 'w') as f:
+        with open(vmat_path, 'wb') as f:
             f.write(content)
         print(f"SUCCESS: {material_type} VMAT file created at: {os.path.abspath(vmat_path)}")
+        return True
     except Exception as e:
         print(f"ERROR: Could not write VMAT file to {vmat_path}. Error: {e}")
+        return False
 
 
 def create_vmat_files_conditionally(skybox_vmat_path, moondome_vmat_path, sky_texture_path, create_skybox, create_moondome):
     """
     Creates VMAT files based on environment variables instead of popup dialogs.
+    Returns the paths of the VMAT files that were written.
     """
     print("\n" + "=" * 50)
     print("VMAT Generation Phase")
     print("=" * 50)
     
-    saved_count = 0
+    written_paths = []
     
-    # Generate content with the resolved path
-    ldr_content = get_ldr_vmat_content(sky_texture_path)
-    moondome_content = get_moondome_vmat_content(sky_texture_path)
+    # Fill the pre-encoded templates with the resolved path
+    sky_texture_bytes = sky_texture_path.encode('utf-8')
+    ldr_content = SKYBOX_VMAT_TEMPLATE.replace(VMAT_TEXTURE_PLACEHOLDER, sky_texture_bytes)
+    moondome_content = MOONDOME_VMAT_TEMPLATE.replace(VMAT_TEXTURE_PLACEHOLDER, sky_texture_bytes)
 
     # --- 1. Skybox VMAT Creation ---
     if create_skybox:
         try:
-            generate_vmat_content_and_save(skybox_vmat_path, ldr_content, "Skybox")
-            saved_count += 1
+            if generate_vmat_content_and_save(skybox_vmat_path, ldr_content, "Skybox"):
+                written_paths.append(skybox_vmat_path)
         except Exception as e:
             print(f"Skybox VMAT creation failed: {e}")
     else:
@@ -630,20 +668,21 @@ def create_vmat_files_conditionally(skybox_vmat_path, moondome_vmat_path, sky_te
     # --- 2. Moondome VMAT Creation ---
     if create_moondome:
         try:
-            generate_vmat_content_and_save(moondome_vmat_path, moondome_content, "Moondome")
-            saved_count += 1
+            if generate_vmat_content_and_save(moondome_vmat_path, moondome_content, "Moondome"):
+                written_paths.append(moondome_vmat_path)
         except Exception as e:
             print(f"Moondome VMAT creation failed: {e}")
     else:
         print("Moondome VMAT creation skipped.")
         
     print("-" * 50)
-    if saved_count > 0:
-        print(f"Completed: Created {saved_count} VMAT file(s)")
+    if written_paths:
+        print(f"Completed: Created {len(written_paths)} VMAT file(s)")
     else:
         print("VMAT creation completely skipped.")
     
     print("=" * 50)
+    return written_paths
 
 
 def clean_up_source_files(filenames_map, directory):
@@ -821,11 +860,94 @@ def clean_up_original_source_files(original_file_list):
         print("Cleanup completed: No files were removed due to errors")
 
 
-def stitch_cubemap_rotated(filenames_map, output_file_path, temp_dir):
+def convert_face_to_png(path, temp_dir):
+    """
+    Converts a single face to a PNG that PIL can load (VTF and EXR go through a
+    temporary file, all other formats are used directly).
+    Returns (png_path, source_format_type, is_temp_file).
+    """
+    path_lower = path.lower()
+
+    if path_lower.endswith('.vtf'):
+        import shutil
+        # Faces convert concurrently: each VTFCmd run gets its own folder, so the
+        # "first .png in the folder" fallback can never pick up another face's output
+        job_dir = tempfile.mkdtemp(dir=temp_dir)
+        try:
+            job_png = convert_vtf_to_png(path, job_dir)
+            png_path = os.path.join(temp_dir, os.path.basename(job_png))
+            os.replace(job_png, png_path)
+        finally:
+            shutil.rmtree(job_dir, ignore_errors=True)
+        return png_path, 'default', True
+
+    if path_lower.endswith('.exr'):
+        base_name = os.path.splitext(os.path.basename(path))[0]
+        png_path = os.path.join(temp_dir, base_name + ".temp_converted.png")
+
+        print(f"Converting '{os.path.basename(path)}' (EXR) to PNG...")
+        if not convert_exr_to_png(path, png_path):
+            raise Exception(f"Error converting EXR file '{path}'")
+        print(f"     -> Saved temporary file: {os.path.basename(png_path)}")
+        return png_path, 'exr', True
+
+    # All other formats (PNG, JPG, TGA, HDR, etc.) are loaded directly
+    return path, 'default', False
+
+
+MMAP_THRESHOLD_BYTES = 4 * 1024 * 1024
+
+def load_face_image(face, path):
+    """
+    Loads a face as RGBA, downscaling it to at most 256px on the long side
+    (aspect ratio preserved) to prevent out-of-memory errors.
+    """
+    if os.path.getsize(path) > MMAP_THRESHOLD_BYTES:
+        # Large (typically uncompressed TGA) faces are decoded straight from a memory map
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            img = Image.open(mm).convert("RGBA")
+    else:
+        img = Image.open(path).convert("RGBA")
+
+    width, height = img.size
+    max_size = 256
+    if width > max_size or height > max_size:
+        if width > height:
+            new_width = max_size
+            new_height = int(height * max_size / width)
+        else:
+            new_height = max_size
+            new_width = int(width * max_size / height)
+        img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
+        print(f"Resized {face} from {width}x{height} to {new_width}x{new_height}")
+
+    return img
+
+
+def resize_face(img, size):
+    """
+    Resizes a face to size x size. Already-matching faces are returned as is,
+    LANCZOS is only used when downscaling; upscales and near-identity scales
+    use the much cheaper BILINEAR filter.
+    """
+    width, height = img.size
+    if (width, height) == (size, size):
+        return img
+
+    min_ratio = min(size / width, size / height)
+    if min_ratio < 0.98:
+        resample = Image.Resampling.LANCZOS
+    else:
+        resample = Image.Resampling.BILINEAR
+    return img.resize((size, size), resample)
+
+
+def stitch_cubemap_rotated(filenames_map, output_file_path, temp_dir, run_during_save=None):
     """
     Performs file conversion, stitching, and applies source format-specific 
     rotations/placements.
     Supports standard 1:1 faces (CS:GO/CS2) and 2:1 horizontal faces (TF2/HL2).
+    run_during_save: optional callable (e.g. VMAT creation) run while the PNG is encoded.
     """
     print("-" * 50)
     print("Starting Skybox Converter")
@@ -845,52 +967,38 @@ def stitch_cubemap_rotated(filenames_map, output_file_path, temp_dir):
         print(f"Created output directory: {temp_dir}")
 
     # --- 1. Conversion Stage (VTF and EXR to temporary PNG) ---
-    for face, path in filenames_map.items():
-        path_lower = path.lower()
-        source_format_type = 'default'
-        
-        if path_lower.endswith('.vtf'):
-            try:
-                # Use a specific temp name for converted VTF files
-                png_path = os.path.join(temp_dir, os.path.splitext(os.path.basename(path))[0] + ".temp_converted.png")
-                
-                # Use the convert function to get the path
-                converted_path = convert_vtf_to_png(path, temp_dir) 
-                
-                png_paths_map[face] = converted_path
-                temp_files.append(converted_path)
-            except Exception:
-                for f in temp_files:
-                    try: os.remove(f)
-                    except: pass
-                return False
-        
-        elif path_lower.endswith('.exr'):
-            source_format_type = 'exr'
-            if not EXR_SUPPORT_ENABLED:
+    if not EXR_SUPPORT_ENABLED:
+        for path in filenames_map.values():
+            if path.lower().endswith('.exr'):
                 print(f"\nFATAL ERROR: Cannot convert EXR file '{os.path.basename(path)}'.")
                 print("The 'openexr-numpy' library is missing.")
                 return False
-            
-            base_name = os.path.splitext(os.path.basename(path))[0]
-            png_filename = base_name + ".temp_converted.png" 
-            png_path = os.path.join(temp_dir, png_filename)
 
-            print(f"Converting '{os.path.basename(path)}' (EXR) to PNG...")
-            if convert_exr_to_png(path, png_path):
-                png_paths_map[face] = png_path
+    # Faces are independent, so convert them concurrently. Capped at 3 workers
+    # so we don't spawn a VTFCmd.exe per face on small machines.
+    conversion_failed = False
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        futures = {face: executor.submit(convert_face_to_png, path, temp_dir)
+                   for face, path in filenames_map.items()}
+        for face, future in futures.items():
+            try:
+                png_path, source_format_type, is_temp_file = future.result()
+            except Exception as e:
+                print(f"Error converting '{face}' face: {e}. Stopping.")
+                conversion_failed = True
+                continue
+
+            png_paths_map[face] = png_path
+            if is_temp_file:
                 temp_files.append(png_path)
-                print(f"     -> Saved temporary file: {os.path.basename(png_path)}")
-            else:
-                print(f"Error converting EXR file '{path}'. Stopping.")
-                return False
+            # Store source format type for later use in transformations
+            face_source_info[face] = source_format_type
 
-        else:
-            # All other formats (PNG, JPG, TGA, HDR, etc.) are loaded directly
-            png_paths_map[face] = path
-            
-        # Store source format type for later use in transformations
-        face_source_info[face] = source_format_type
+    if conversion_failed:
+        for f in temp_files:
+            try: os.remove(f)
+            except: pass
+        return False
 
 
     # --- 2. Load Images and Determine Face Size and Ratio (CORRECTED LOGIC) ---
@@ -899,24 +1007,14 @@ def stitch_cubemap_rotated(filenames_map, output_file_path, temp_dir):
         valid_sizes = []
         MIN_SIZE = 64 # Ignore extremely small images (like 4x4 placeholders)
 
-        # Load all images first
-        for face, path in png_paths_map.items():
-            img = Image.open(path).convert("RGBA")
-            
-            # Resize image to prevent out-of-memory errors (max 256x256, preserve aspect ratio)
-            width, height = img.size
-            max_size = 256
-            if width > max_size or height > max_size:
-                if width > height:
-                    new_width = max_size
-                    new_height = int(height * max_size / width)
-                else:
-                    new_height = max_size
-                    new_width = int(width * max_size / height)
-                img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-                print(f"Resized {face} from {width}x{height} to {new_width}x{new_height}")
-            
-            images[face] = img
+        # Load all images first - decoding releases the GIL, so faces load in parallel
+        with ThreadPoolExecutor(max_workers=6) as executor:
+            futures = {face: executor.submit(load_face_image, face, path)
+                       for face, path in png_paths_map.items()}
+            for face, future in futures.items():
+                images[face] = future.result()
+
+        for img in images.values():
             w, h = img.size
             if w >= MIN_SIZE and h >= MIN_SIZE:
                 valid_sizes.append((w, h))
@@ -966,39 +1064,27 @@ def stitch_cubemap_rotated(filenames_map, output_file_path, temp_dir):
     final_width = base_unit_size * 4
     final_height = base_unit_size * 3
 
-    # Defines the coordinates of the 6 slots in the final 4x3 image
-    COORDS = {
-        'up':      (base_unit_size * 1, base_unit_size * 0),
-        'left':    (base_unit_size * 0, base_unit_size * 1),
-        'front':   (base_unit_size * 1, base_unit_size * 1),
-        'right':   (base_unit_size * 2, base_unit_size * 1),
-        'back':    (base_unit_size * 3, base_unit_size * 1),
-        'down':    (base_unit_size * 1, base_unit_size * 2),
-    }
-
     # Create the empty image matrix (the final image) with black background.
-    final_image = Image.new('RGBA', (final_width, final_height), (0, 0, 0, 0))
+    # Faces are blitted straight into this array instead of PIL pasting per slot.
+    final_pixels = np.zeros((final_height, final_width, 4), dtype=np.uint8)
     print(f"Final stitched cubemap canvas size: {final_width}x{final_height}")
 
     print("\nStitching images using format-specific rotations and placements...")
     
     # Loop over the TARGET SLOTS 
-    for target_slot in TARGET_SLOTS:
+    for slot_index, target_slot in enumerate(TARGET_SLOTS):
         
         # --- Select Transformation Map based on detected source type ---
-        transform_map = DEFAULT_TRANSFORMS
         config_name = "DEFAULT_TRANSFORMS"
         source_format = face_source_info.get(target_slot, 'default')
 
         if source_format == 'exr':
-            transform_map = EXR_TRANSFORMS
             config_name = "EXR_TRANSFORMS"
         elif is_dome_map and source_format != 'exr': 
-            transform_map = HL2_TF2_DOME_TRANSFORMS
             config_name = "HL2_TF2_DOME_TRANSFORMS"
 
         # Get the transformation values from the selected map
-        source_face, rotation_degrees, flip = transform_map.get(target_slot, (target_slot, 0, None))
+        source_face, rotation_degrees, flip = SLOT_TRANSFORMS[config_name][slot_index]
         
         image_to_paste = images[source_face] 
         transform_description = []
@@ -1014,25 +1100,32 @@ def stitch_cubemap_rotated(filenames_map, output_file_path, temp_dir):
         elif is_dome_map and target_slot in ['left', 'front', 'right', 'back']:
             # Dome Map Horizontal Face (2:1 -> W x H) to 1:1 Slot (H x H)
             # Resize the 2:1 image to fill the entire square slot
-            image_to_paste = image_to_paste.resize((base_unit_size, base_unit_size), Image.Resampling.LANCZOS)
+            image_to_paste = resize_face(image_to_paste, base_unit_size)
             transform_description.append(f"Dome Map (2:1) stretched to 1:1")
             
         else:
             # Standard resize: Scale any other 1:1 image to the correct 1:1 slot size.
-            image_to_paste = image_to_paste.resize((base_unit_size, base_unit_size), Image.Resampling.LANCZOS)
-            transform_description.append("Resized to 1:1 Slot")
+            if image_to_paste.size != (base_unit_size, base_unit_size):
+                image_to_paste = resize_face(image_to_paste, base_unit_size)
+                transform_description.append("Resized to 1:1 Slot")
 
 
         # --- 2b. Apply Transformations (Rotation/Flip) ---
+        # Quarter turns and flips are NumPy views, so no intermediate images are allocated
+        face_pixels = np.asarray(image_to_paste)
 
-        # Apply Rotation - use NEAREST resample to avoid blur from interpolation
+        # Apply Rotation
         if rotation_degrees != 0:
-            image_to_paste = image_to_paste.rotate(rotation_degrees, expand=False, resample=Image.Resampling.NEAREST)
+            if rotation_degrees % 90 == 0:
+                face_pixels = np.rot90(face_pixels, (rotation_degrees // 90) % 4)
+            else:
+                # Arbitrary angle - use NEAREST resample to avoid blur from interpolation
+                face_pixels = np.asarray(image_to_paste.rotate(rotation_degrees, expand=False, resample=Image.Resampling.NEAREST))
             transform_description.append(f"Rotated {rotation_degrees}° CCW")
         
         # Apply Flip/Transpose
         if flip is not None:
-            image_to_paste = image_to_paste.transpose(flip)
+            face_pixels = NUMPY_TRANSPOSES[flip](face_pixels)
             transform_description.append(f"Applied Transpose: {str(flip).split('.')[-1]}")
             
         # Log the operation
@@ -1043,11 +1136,31 @@ def stitch_cubemap_rotated(filenames_map, output_file_path, temp_dir):
         print(f"Pasting {desc} into target '{target_slot}' slot...")
 
         # --- 2c. Final Paste ---
-        position = COORDS[target_slot]
-        final_image.paste(image_to_paste, position)
+        grid_x, grid_y = SLOT_GRID_POSITIONS[slot_index]
+        x, y = grid_x * base_unit_size, grid_y * base_unit_size
+        final_pixels[y:y + base_unit_size, x:x + base_unit_size] = face_pixels
 
     # --- 5. Save the final image and Clean up ---
-    final_image.save(output_file_path, "PNG")
+    final_image = Image.fromarray(final_pixels, 'RGBA')
+    # Low zlib level: the PNG is recompiled by the engine anyway, size barely matters.
+    # The encoder releases the GIL, so independent work (VMAT writes) overlaps with it.
+    # run_during_save returns the paths it wrote, removed again if the save fails.
+    written_during_save = []
+    try:
+        if run_during_save:
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                save_future = executor.submit(final_image.save, output_file_path, "PNG", compress_level=1, optimize=False)
+                written_during_save = run_during_save() or []
+                save_future.result()
+        else:
+            final_image.save(output_file_path, "PNG", compress_level=1, optimize=False)
+    except Exception as e:
+        print(f"ERROR: Could not save stitched cubemap to {output_file_path}. Error: {e}")
+        # VMATs written alongside would point at a texture that doesn't exist
+        for f in written_during_save + temp_files:
+            try: os.remove(f)
+            except OSError: pass
+        return False
     print("-" * 50)
     print(f"SUCCESS: Stitched cubemap saved to: {os.path.abspath(output_file_path)}")
     print(f"Final resolution: {final_width}x{final_height}")
@@ -1104,11 +1217,11 @@ if __name__ == "__main__":
     FINAL_MOONDOME_VMAT_PATH = os.path.join(OUTPUT_DIR, FINAL_MOONDOME_VMAT_FILENAME)
     
     # 4. Convert and stitch the found files
-    success = stitch_cubemap_rotated(file_map, FINAL_OUTPUT_PATH, OUTPUT_DIR)
-    
-    # 5. Optional VMAT creation after successful stitching
-    if success and (CREATE_SKYBOX_VMAT or CREATE_MOONDOME_VMAT):
-        create_vmat_files_conditionally(FINAL_SKYBOX_VMAT_PATH, FINAL_MOONDOME_VMAT_PATH, SKYTEXTURE_PATH, CREATE_SKYBOX_VMAT, CREATE_MOONDOME_VMAT)
+    # 5. Optional VMAT creation, written while the stitched PNG is being saved
+    create_vmats = None
+    if CREATE_SKYBOX_VMAT or CREATE_MOONDOME_VMAT:
+        create_vmats = lambda: create_vmat_files_conditionally(FINAL_SKYBOX_VMAT_PATH, FINAL_MOONDOME_VMAT_PATH, SKYTEXTURE_PATH, CREATE_SKYBOX_VMAT, CREATE_MOONDOME_VMAT)
+    success = stitch_cubemap_rotated(file_map, FINAL_OUTPUT_PATH, OUTPUT_DIR, run_during_save=create_vmats)
         
     # 6. Optional source file cleanup after VMAT creation
     if success:
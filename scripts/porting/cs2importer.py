@@ -43,7 +43,8 @@ utils_path = resource_path('utils')
 if not os.path.exists(utils_path):
     # If running from scripts/porting, go up two levels to find utils
     utils_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'utils'))
-sys.path.insert(0, utils_path)
+if utils_path not in sys.path:
+    sys.path.insert(0, utils_path)
 
 try:
     from theme_manager import ThemeManager
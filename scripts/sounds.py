@@ -13,39 +13,113 @@ import os
 import re
 import shutil
 import tempfile
+import json
 import winreg
 import vdf
 from tkinter import filedialog
 import tkinter as tk
 from PIL import Image
+import numpy as np
 import threading
+import wave
+import mmap
+import struct
+import queue
+from collections import deque, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import time
 import urllib.request
 import zipfile
+import zlib
 import io
+import functools
 
 # Try to import optional modules
-try:
-    import vpk
-except ImportError:
-    print("Warning: vpk module not available. Install with: pip install python-vpk")
-    vpk = None
-
 try:
     import pygame
 except ImportError:
     print("Warning: pygame module not available. Install with: pip install pygame")
     pygame = None
 
-# Try to import VSND decompiler
-try:
-    from vsnd_decompiler import VSNDDecompiler
-    VSND_DECOMPILER = VSNDDecompiler()
-except Exception as e:
-    print(f"Warning: VSND decompiler not available: {e}")
-    VSND_DECOMPILER = None
-
 # Constants
 CUSTOM_TITLE_BAR_HEIGHT = 30
+TITLE_BUTTON_SIZE = 20
+# Glyphs of the title bar buttons as (x0, y0, x1, y1) offsets from the button's top-left corner
+MINIMIZE_GLYPH_RECT = ((TITLE_BUTTON_SIZE - 8) // 2, (TITLE_BUTTON_SIZE - 1) // 2,
+                       (TITLE_BUTTON_SIZE - 8) // 2 + 8, (TITLE_BUTTON_SIZE - 1) // 2 + 2)  # 8px wide line
+CLOSE_GLYPH_RECT = (TITLE_BUTTON_SIZE // 2 - 3, TITLE_BUTTON_SIZE // 2 - 3,
+                    TITLE_BUTTON_SIZE // 2 + 3, TITLE_BUTTON_SIZE // 2 + 3)  # 6px X
+IDLE_EVENT_TIMEOUT = 0.25  # Seconds to block waiting for input when nothing is animating
+ACTIVE_EVENT_TIMEOUT = 1.0 / 60.0  # Redraw rate while playing, loading or dragging
+MIN_FRAME_TIME = 1.0 / 60.0  # Software frame cap (vsync is disabled)
+REDRAW_FRAMES_AFTER_CHANGE = 3  # ImGui needs a few frames to settle hover/active state after input
+SUBPROCESS_FLAGS = getattr(subprocess, 'CREATE_NO_WINDOW', 0)  # Hide console windows of ffmpeg/resourcecompiler runs (Windows only)
+
+# VPK directory format (https://developer.valvesoftware.com/wiki/VPK_File_Format)
+VPK_SIGNATURE = 0x55AA1234
+VPK_ENTRY_SIZE = 18  # CRC32, preload bytes, archive index, entry offset, entry length, terminator
+
+WAVEFORM_BLOCK_FRAMES = 1 << 20  # Frames decoded per block when computing waveform peaks
+
+# Closing brace of a soundevents entry (tab-indented, on its own line) and its line ending
+SOUNDEVENT_END_PATTERN = re.compile(rb'^\t\}[^\n]*\n?', re.MULTILINE)
+
+# Soundevents entry, filled by update_soundevents_file with one % interpolation
+SOUNDEVENT_TEMPLATE = (
+    '\t"%s" =\n'
+    '\t{\n'
+    '\t\ttype = "%s"\n'
+    '\t\tvsnd_files_track_01 = "%s"\n'
+    '\t\tvolume = %.1f\n'
+    '\t\tpitch = %.2f\n'
+    '%s'
+    '\t\tuse_distance_volume_mapping_curve = true\n'
+    '\t\tdistance_volume_mapping_curve = \n'
+    '\t\t[\n'
+    '\t\t\t[%.1f, %.1f, %.3f, %.3f, %.3f, %.3f,],\n'
+    '\t\t\t[%.1f, %.1f, %.3f, %.3f, %.3f, %.3f],\n'
+    '\t\t\t[%.1f, %.1f, 0.0, 0.0, 1.0, 1.0],\n'
+    '\t\t]\n'
+    '\t\tocclusion = %s\n'
+    '\t\tocclusion_intensity = %d\n'
+    '\t}\n'
+)
+
+# Status colors (RGBA)
+STATUS_RED = (1.0, 0.0, 0.0, 1.0)
+STATUS_GREEN = (0.0, 1.0, 0.0, 1.0)
+STATUS_YELLOW = (1.0, 1.0, 0.0, 1.0)
+STATUS_WHITE = (1.0, 1.0, 1.0, 1.0)
+
+# Pre-built style color stacks for the fixed-color buttons: ((imgui color index, RGBA), ...)
+MINIMIZE_BUTTON_COLORS = (
+    (imgui.COLOR_BUTTON, (0.0, 0.0, 0.0, 0.0)),  # Transparent
+    (imgui.COLOR_BUTTON_HOVERED, (0.2, 0.2, 0.2, 1.0)),  # Dark gray
+    (imgui.COLOR_BUTTON_ACTIVE, (0.15, 0.15, 0.15, 1.0)),
+    (imgui.COLOR_BORDER, (0.0, 0.0, 0.0, 0.0)),  # No border
+)
+CLOSE_BUTTON_COLORS = (
+    (imgui.COLOR_BUTTON, (0.0, 0.0, 0.0, 0.0)),  # Transparent
+    (imgui.COLOR_BUTTON_HOVERED, (0.9, 0.2, 0.2, 1.0)),  # Red
+    (imgui.COLOR_BUTTON_ACTIVE, (0.8, 0.15, 0.15, 1.0)),
+    (imgui.COLOR_BORDER, (0.0, 0.0, 0.0, 0.0)),  # No border
+)
+OPEN_FOLDER_BUTTON_COLORS = (
+    (imgui.COLOR_BUTTON, (0.8, 0.7, 0.2, 1.0)),  # Yellow
+    (imgui.COLOR_BUTTON_HOVERED, (0.9, 0.8, 0.3, 1.0)),
+    (imgui.COLOR_BUTTON_ACTIVE, (0.7, 0.6, 0.15, 1.0)),
+)
+ADD_SOUND_BUTTON_COLORS = (
+    (imgui.COLOR_BUTTON, (0.2, 0.7, 0.3, 1.0)),  # Green
+    (imgui.COLOR_BUTTON_HOVERED, (0.3, 0.8, 0.4, 1.0)),
+    (imgui.COLOR_BUTTON_ACTIVE, (0.15, 0.6, 0.25, 1.0)),
+)
+
+
+def push_style_colors(colors):
+    """Push a pre-built style color stack, pop with imgui.pop_style_color(len(colors))"""
+    for color_index, rgba in colors:
+        imgui.push_style_color(color_index, *rgba)
 
 
 def resource_path(relative_path):
@@ -58,11 +132,220 @@ def resource_path(relative_path):
     return os.path.join(base_path, relative_path)
 
 
+def read_vpk_paths(pak_path, extension=b'vsnd_c'):
+    """List 'dir/name' paths (without extension) of one file type in a VPK directory, parsed from a memory map"""
+    paths = []
+    append = paths.append
+    with open(pak_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+        signature, version, tree_size = struct.unpack_from('<III', buf, 0)
+        if signature != VPK_SIGNATURE:
+            raise ValueError(f"Not a VPK directory file: {pak_path}")
+        pos = 28 if version == 2 else 12  # v2 header has four extra section sizes
+        tree_end = pos + tree_size
+        find = buf.find
+        
+        # Tree is extension -> directory -> filename, each level a run of null-terminated
+        # strings closed by an empty one; only the wanted extension gets decoded
+        while pos < tree_end:
+            end = find(b'\x00', pos)
+            if end == pos:
+                break
+            wanted = buf[pos:end] == extension
+            pos = end + 1
+            
+            while True:
+                end = find(b'\x00', pos)
+                if end == pos:
+                    pos += 1
+                    break
+                if wanted:
+                    directory = buf[pos:end]
+                    prefix = '' if directory == b' ' else directory.decode('utf-8', 'replace') + '/'
+                pos = end + 1
+                
+                while True:
+                    end = find(b'\x00', pos)
+                    if end == pos:
+                        pos += 1
+                        break
+                    if wanted:
+                        append(prefix + buf[pos:end].decode('utf-8', 'replace'))
+                    # Skip the entry record and any preloaded file data that follows it
+                    preload_bytes = buf[end + 5] | (buf[end + 6] << 8)
+                    pos = end + 1 + VPK_ENTRY_SIZE + preload_bytes
+    return paths
+
+
+def fix_piped_wav_header(data):
+    """Fill in the RIFF and data chunk sizes of a WAV ffmpeg wrote to a pipe (it can't seek back to set them)"""
+    wav = bytearray(data)
+    struct.pack_into('<I', wav, 4, len(wav) - 8)
+    pos = 12
+    while pos + 8 <= len(wav):
+        chunk_id = bytes(wav[pos:pos + 4])
+        if chunk_id == b'data':
+            struct.pack_into('<I', wav, pos + 4, len(wav) - pos - 8)
+            break
+        chunk_size = struct.unpack_from('<I', wav, pos + 4)[0]
+        pos += 8 + chunk_size + (chunk_size & 1)  # Chunks are word aligned
+    return bytes(wav)
+
+
+def pcm_to_wav(frames, n_channels, framerate, sampwidth):
+    """Wrap raw little-endian PCM frames in a minimal 44-byte WAV header"""
+    block_align = n_channels * sampwidth
+    header = struct.pack('<4sI4s4sIHHIIHH4sI', b'RIFF', 36 + len(frames), b'WAVE', b'fmt ', 16, 1,
+                         n_channels, framerate, framerate * block_align, block_align, sampwidth * 8,
+                         b'data', len(frames))
+    return header + bytes(frames)
+
+
+def link_or_copy(src, dst):
+    """Hardlink src to dst (no bytes copied) when both are on one volume, otherwise copy the file"""
+    try:
+        os.remove(dst)  # os.link won't replace an existing file
+    except FileNotFoundError:
+        pass
+    except OSError:
+        shutil.copyfile(src, dst)  # Can't replace it (e.g. locked), let copyfile overwrite or raise
+        return
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copyfile(src, dst)  # Different volume or no hardlink support
+
+
+def wav_data_offset(wav_path):
+    """File offset of a WAV's sample data (payload of the data chunk), None if the header can't be walked"""
+    try:
+        with open(wav_path, 'rb') as f:
+            header = f.read(12)
+            if len(header) < 12 or header[:4] != b'RIFF' or header[8:12] != b'WAVE':
+                return None
+            pos = 12
+            while True:
+                f.seek(pos)
+                chunk = f.read(8)
+                if len(chunk) < 8:
+                    return None
+                chunk_id, chunk_size = struct.unpack('<4sI', chunk)
+                if chunk_id == b'data':
+                    return pos + 8
+                pos += 8 + chunk_size + (chunk_size & 1)  # Chunks are word aligned
+    except OSError:
+        return None
+
+
+def wav_waveform_peaks(wav_file, num_buckets, wav_path=None):
+    """Peak amplitude (0-1, channels averaged) per bucket of an open wave file, streamed in bounded blocks
+    
+    If wav_path is given the sample data is memory-mapped and sliced instead of copied out with readframes.
+    """
+    n_frames = wav_file.getnframes()
+    n_channels = wav_file.getnchannels()
+    sampwidth = wav_file.getsampwidth()
+    
+    chunk_size = max(1, n_frames // num_buckets)
+    num_chunks = min(n_frames // chunk_size, num_buckets)
+    peaks = np.zeros(num_buckets, dtype=np.float32)  # Missing chunks stay 0
+    
+    if sampwidth not in (1, 2):
+        # Unsupported sample width, use placeholder
+        peaks[:num_chunks] = 0.5
+        return peaks
+    
+    # Map just the frames that fall into buckets, the OS pages them in as the blocks are reduced
+    mapped = None
+    data_offset = wav_data_offset(wav_path) if wav_path else None
+    if data_offset is not None and num_chunks:
+        try:
+            mapped = np.memmap(wav_path, dtype=np.uint8, mode='r', offset=data_offset,
+                               shape=(num_chunks * chunk_size * n_channels * sampwidth,))
+        except (ValueError, OSError):
+            mapped = None  # Truncated file, readframes copes with short data
+    frame_bytes = n_channels * sampwidth
+    
+    # Whole buckets per block, so each block reduces straight into its slice of peaks
+    block_chunks = max(1, WAVEFORM_BLOCK_FRAMES // chunk_size)
+    for first in range(0, num_chunks, block_chunks):
+        block_frames = min(block_chunks, num_chunks - first) * chunk_size
+        if mapped is not None:
+            start = first * chunk_size * frame_bytes
+            frames = mapped[start:start + block_frames * frame_bytes]
+        else:
+            frames = wav_file.readframes(block_frames)
+        # Stay in integers per sample, normalization is applied to the few peaks at the end
+        if sampwidth == 1:
+            samples = np.frombuffer(frames, dtype=np.uint8).astype(np.int16) - 128
+            scale = 1.0 / 128.0
+        else:
+            samples = np.frombuffer(frames, dtype='<i2')
+            scale = 1.0 / 32768.0
+        
+        # If multichannel, average channels (summed here, divided in scale)
+        frames_read = len(samples) // n_channels
+        if n_channels > 1:
+            samples = samples[:frames_read * n_channels].reshape(frames_read, n_channels).sum(axis=1, dtype=np.int32)
+            scale /= n_channels
+        
+        count = frames_read // chunk_size
+        if count == 0:
+            break  # Truncated file
+        
+        # Peak |sample| from per-chunk max/min (reductions on a view, no abs() copy of the block)
+        chunks = samples[:count * chunk_size].reshape(count, chunk_size)
+        highs = chunks.max(axis=1).astype(np.float32)
+        lows = chunks.min(axis=1).astype(np.float32)
+        peaks[first:first + count] = np.maximum(highs, -lows) * scale
+    
+    return peaks
+
+
+@functools.lru_cache(maxsize=None)
+def find_icon(filename):
+    """Resolve an icon in the icons folder once, returns None if it doesn't exist"""
+    icon_path = resource_path(os.path.join("icons", filename))
+    return icon_path if os.path.exists(icon_path) else None
+
+
+def load_icon_rgba(filename, size, cache_dir):
+    """RGBA bytes of an icon resized to size x size, cached on disk so PIL only runs once per icon"""
+    icon_path = find_icon(filename)
+    if not icon_path:
+        return None
+    
+    # Key the cache on the icon's contents (bundled files get a fresh mtime on every extraction)
+    with open(icon_path, 'rb') as f:
+        icon_crc = zlib.crc32(f.read())
+    cache_path = os.path.join(cache_dir, f"{os.path.splitext(filename)[0]}_{size}_{icon_crc:08x}.rgba")
+    try:
+        with open(cache_path, 'rb') as f:
+            img_data = f.read()
+        if len(img_data) == size * size * 4:
+            return img_data
+    except OSError:
+        pass
+    
+    img = Image.open(icon_path)
+    if img.mode != "RGBA":
+        img = img.convert("RGBA")
+    img_data = img.resize((size, size), Image.Resampling.LANCZOS).tobytes()
+    
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(cache_path, 'wb') as f:
+            f.write(img_data)
+    except OSError:
+        pass  # Cache is optional, the icon still loads
+    return img_data
+
+
 # Import theme manager after resource_path is defined
 utils_path = resource_path('utils')
 if not os.path.exists(utils_path):
     utils_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'utils'))
-sys.path.insert(0, utils_path)
+if utils_path not in sys.path:
+    sys.path.insert(0, utils_path)
 
 try:
     from theme_manager import ThemeManager
@@ -94,6 +377,8 @@ class SoundsManagerApp:
         self.sound_file_display = "None selected"
         self.sound_name = ""  # Name for the soundevent (without extension)
         self.output_name = ""  # User-editable output name for the sound file
+        self.compiling_sound = False  # add_sound's resourcecompiler jobs are still running
+        self.event_patterns = {}  # Event name -> compiled pattern matching the start of its soundevents entry
         
         # Internal sound browser
         self.internal_sounds = []  # List of internal sound paths from VPK
@@ -103,21 +388,27 @@ class SoundsManagerApp:
         self.selected_internal_sound = ""
         self.internal_sound_filter = ""
         self.filtered_internal_sounds = []
+        self.filtered_internal_sounds_tree = {}  # Tree for the current filter (built on change, not per frame)
+        self.flat_tree_rows = []  # Visible rows of filtered_internal_sounds_tree as (depth, folder path, label, (sound, name))
+        self.flat_tree_source = None  # Tree flat_tree_rows was built from
+        self.folder_open = {}  # Folder path -> expanded in the sound browser
+        self.internal_sounds_lower = []  # Lowercase copies of internal_sounds (same indices) for filtering
+        self.filtered_internal_indices = []  # Indices into internal_sounds matching the last search
+        self.last_internal_search = ""  # Lowercase search text the filtered indices belong to
         self.cached_internal_sound_path = ""  # Path to cached/decompiled internal sound WAV
+        self.preview_audio_cache = {}  # VPK path -> (decoded WAV bytes, (st_mtime_ns, st_size) of its cache file) for instant replay
+        self.preparing_preview = False  # Internal sound is being decompiled on a worker thread
+        self.pending_preview = None  # (path, wav bytes or None, analysis wav or None) ready to play, picked up by the render loop
+        self.preview_future = None  # Future of the last submitted preview job
         
         # Audio preview (pygame mixer)
         self.preview_sound = None
         self.preview_playing = False
         self.preview_volume = 0.5  # Default preview volume at 50%
-        if pygame:
-            try:
-                pygame.mixer.init()
-                pygame.mixer.music.set_volume(self.preview_volume)
-            except Exception as e:
-                print(f"Warning: pygame mixer initialization failed: {e}")
-                pygame = None
+        self.mixer_frequency = None  # Frequency the mixer was last initialized with for preview
+        # The mixer itself is opened on first use (see ensure_mixer), not at startup
         
-        # VSND decompiler for internal sound preview
+        # VSND decompiler for internal sound preview (.NET is only loaded on the first decompile)
         self.vsnd_decompiler = None
         try:
             from vsnd_decompiler import VSNDDecompiler
@@ -168,11 +459,21 @@ class SoundsManagerApp:
         # Audio timeline and loop points
         self.audio_duration_ms = 0  # Duration of loaded audio in milliseconds
         self.audio_waveform = []  # Simplified waveform data for visualization
+        self.waveform_cache = OrderedDict()  # (path, mtime_ns, size) -> (duration_ms, waveform), LRU of 16
+        self.analysis_future = None  # Future of a background analyze_audio_file job
+        self.waveform_dirty = True  # audio_waveform changed since waveform_points were built
+        self.waveform_points = ([], [])  # Top and bottom envelope polylines of the drawn waveform, rebuilt only when needed
+        self.waveform_points_origin = None  # Timeline rectangle waveform_points were built for
+        self.analysis_key = None  # Cache key the background analysis result is stored under
+        self.wav_detection = {}  # Extensionless path -> whether it opened as WAV
         self.playback_position_ms = 0  # Current playback position
         self.playback_start_time = 0  # Time when playback started
         self.timeline_width = 550  # Width of timeline visualization (wider)
         self.timeline_height = 100  # Height of timeline visualization
         self.temp_loop_file = None  # Path to temporary loop preview file
+        self.loop_render_key = None  # (path, mtime, loop start, loop end) the loop preview was rendered for
+        self.loop_render_data = None  # WAV bytes of an in-memory (MP3) loop render
+        self.loop_source = None  # ((path, mtime), (channels, rate, sample width, pcm)) of the last decoded MP3
         
         # encoding.txt configuration options
         self.encoding_format = "mp3"  # Compression format: "PCM", "mp3", "adpcm"
@@ -196,11 +497,13 @@ class SoundsManagerApp:
         self.encoding_crossfade_ms = 1  # Crossfade duration in milliseconds
         
         # ffmpeg download state (needed for MP3 to WAV conversion)
-        self.ffmpeg_path = None  # Path to ffmpeg.exe
+        self.ffmpeg_path = None  # Path to ffmpeg.exe, only set once it was found on disk
         self.downloading_ffmpeg = False  # Whether ffmpeg download is in progress
+        self.ffmpeg_download_requested = False  # Set by worker threads, download started on the UI thread
+        self.ffmpeg_download_progress = 0  # Percent of the ffmpeg archive downloaded
         
         # UI state
-        self.sound_status_color = (1.0, 0.0, 0.0, 1.0)    # Red initially
+        self.sound_status_color = STATUS_RED    # Red initially
         
         # Custom title bar drag state
         self.dragging_window = False
@@ -208,8 +511,19 @@ class SoundsManagerApp:
         self.drag_offset_y = 0
         
         # Console output
-        self.console_output = []
-        self.last_console_line_count = 0
+        self.console_output = deque(maxlen=500)  # Most recent log lines only
+        
+        # Log lines and state updates posted by worker threads, drained on the UI thread
+        self.ui_queue = queue.Queue()
+        
+        # Shared workers for VPK loading and preview preparation (bounds concurrent decompiles/ffmpeg runs)
+        self.worker_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix='sounds-worker')
+        
+        # Redraw tracking - an OS repaint with no new input replays the last frame, and an idle
+        # wakeup with nothing changed skips the frame entirely
+        self.input_received = True
+        self.window_refresh_requested = False
+        self.dirty_frames_remaining = REDRAW_FRAMES_AFTER_CHANGE  # Frames still to rebuild after the last change
         
         # Icon textures
         self.title_icon = None
@@ -219,34 +533,44 @@ class SoundsManagerApp:
         # Cursors (will be created after window initialization)
         self.arrow_cursor = None
         self.hand_cursor = None
+        self.current_cursor = None  # Last cursor passed to glfw.set_cursor
+        
+        # Hidden Tk root for file dialogs (see get_tk_root)
+        self.tk_root = None
         
         # Theme tracking
         self.current_theme_name = self.theme_manager.get_theme_name()
+        self.title_bar_bg = None  # Darkened window_bg of the current theme, set by reapply_theme
+        self.title_glyph_color = 0  # Packed color of the minimize/close glyphs, set in init_window
+        
+        # App folders under %LOCALAPPDATA%\Temp, built once instead of on every click
+        sounds_temp_dir = os.path.join(os.getenv('LOCALAPPDATA'), 'Temp', '.CS2KZ-mapping-tools', 'Sounds')
+        self.ffmpeg_dir = os.path.join(sounds_temp_dir, 'ffmpeg')
+        self.loop_preview_path = os.path.join(sounds_temp_dir, 'temp', 'cs2_sound_loop_preview.wav')
+        self.preview_cache_dir = os.path.join(tempfile.gettempdir(), '.CS2KZ-mapping-tools', 'Sounds', 'preview')
+        self.icon_cache_dir = os.path.join(tempfile.gettempdir(), '.CS2KZ-mapping-tools', 'Sounds', 'icons')
+        
+        # Detected CS2 path and addon list from the last run, invalidated by file mtimes
+        self.path_cache_file = os.path.join(tempfile.gettempdir(), '.CS2KZ-mapping-tools', 'Sounds', 'path_cache.json')
+        self.path_cache = self.load_path_cache()
         
         # Detect CS2 path
         self.detect_cs2_path()
         
         # Check if ffmpeg already exists (don't download, just check)
         # MUST have BOTH ffmpeg.exe and ffprobe.exe (pydub needs both)
-        ffmpeg_dir = os.path.join(os.getenv('LOCALAPPDATA'), 'Temp', '.CS2KZ-mapping-tools', 'Sounds', 'ffmpeg')
-        ffmpeg_path = os.path.join(ffmpeg_dir, 'ffmpeg.exe')
-        ffprobe_path = os.path.join(ffmpeg_dir, 'ffprobe.exe')
-        if os.path.exists(ffmpeg_path) and os.path.exists(ffprobe_path):
-            self.ffmpeg_path = ffmpeg_path
+        ffmpeg_dir = self.ffmpeg_dir
+        try:
+            ffmpeg_files = set(os.listdir(ffmpeg_dir))  # One directory read instead of two exists() probes
+        except OSError:
+            ffmpeg_files = set()
+        if {'ffmpeg.exe', 'ffprobe.exe'} <= ffmpeg_files:
+            self.ffmpeg_path = os.path.join(ffmpeg_dir, 'ffmpeg.exe')
             # Configure environment for pydub (add ffmpeg directory to PATH)
-            try:
-                ffmpeg_dir_path = os.path.dirname(ffmpeg_path)
-                # Add ffmpeg directory to PATH so pydub can find it
-                if 'PATH' in os.environ:
-                    os.environ['PATH'] = ffmpeg_dir_path + os.pathsep + os.environ['PATH']
-                else:
-                    os.environ['PATH'] = ffmpeg_dir_path
-                print(f"✓ Added ffmpeg to PATH: {ffmpeg_dir_path}")
-            except Exception as e:
-                print(f"⚠ ffmpeg PATH configuration warning: {e}")
+            self.add_to_path(ffmpeg_dir)
         
         # Clean up old preview cache on startup
-        cache_dir = os.path.join(tempfile.gettempdir(), '.CS2KZ-mapping-tools', 'Sounds', 'preview')
+        cache_dir = self.preview_cache_dir
         if os.path.exists(cache_dir):
             self.cleanup_preview_cache(cache_dir, max_files=5)
         
@@ -259,6 +583,14 @@ class SoundsManagerApp:
         self.content_height = 0  # Will be calculated during first render
         self.base_window_height = 800  # Initial height, will scale dynamically based on content
     
+    def add_to_path(self, directory):
+        """Prepend a directory to PATH unless it's already on it (the launcher can hand down our PATH)"""
+        path = os.environ.get('PATH', '')
+        if directory in path.split(os.pathsep):
+            return
+        os.environ['PATH'] = directory + os.pathsep + path if path else directory
+        print(f"✓ Added to PATH: {directory}")
+    
     def detect_cs2_path(self):
         """Detect CS2 installation path from Steam"""
         try:
@@ -276,6 +608,16 @@ class SoundsManagerApp:
                 self.log("✗ Steam library folders not found")
                 return False
             
+            # Reuse last run's result while libraryfolders.vdf is unchanged
+            libraryfolders_mtime = os.path.getmtime(libraryfolders_path)
+            cached_basefolder = self.path_cache.get('cs2_basefolder')
+            if (self.path_cache.get('libraryfolders_path') == libraryfolders_path
+                    and self.path_cache.get('libraryfolders_mtime') == libraryfolders_mtime
+                    and cached_basefolder and os.path.exists(cached_basefolder)):
+                self.cs2_basefolder = cached_basefolder
+                self.log(f"✓ CS2 detected at: {self.cs2_basefolder}")
+                return True
+            
             with open(libraryfolders_path, 'r', encoding='utf-8') as file:
                 library_data = vdf.load(file)
             
@@ -295,6 +637,10 @@ class SoundsManagerApp:
             
             if os.path.exists(self.cs2_basefolder):
                 self.log(f"✓ CS2 detected at: {self.cs2_basefolder}")
+                self.path_cache.update(libraryfolders_path=libraryfolders_path,
+                                       libraryfolders_mtime=libraryfolders_mtime,
+                                       cs2_basefolder=self.cs2_basefolder)
+                self.save_path_cache()
                 return True
             else:
                 self.log(f"✗ CS2 folder not found at {self.cs2_basefolder}")
@@ -314,14 +660,42 @@ class SoundsManagerApp:
             return []
         
         try:
+            # Folder mtime changes whenever an addon is added, removed or renamed
+            addons_mtime = os.path.getmtime(addons_path)
+            if (self.path_cache.get('addons_path') == addons_path
+                    and self.path_cache.get('addons_mtime') == addons_mtime
+                    and 'addons' in self.path_cache):
+                return self.path_cache['addons']
+            
             # Get all directories in csgo_addons
-            addons = [d for d in os.listdir(addons_path) 
-                     if os.path.isdir(os.path.join(addons_path, d))]
-            return sorted(addons)
+            with os.scandir(addons_path) as entries:
+                addons = sorted(entry.name for entry in entries if entry.is_dir())
+            
+            self.path_cache.update(addons_path=addons_path, addons_mtime=addons_mtime, addons=addons)
+            self.save_path_cache()
+            return addons
         except Exception as e:
             self.log(f"✗ Error scanning addons: {e}")
             return []
     
+    def load_path_cache(self):
+        """Load cached CS2 path / addon list from disk (empty dict if missing or invalid)"""
+        try:
+            with open(self.path_cache_file, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+            return cache if isinstance(cache, dict) else {}
+        except (OSError, ValueError):
+            return {}
+    
+    def save_path_cache(self):
+        """Write the CS2 path / addon cache to disk"""
+        try:
+            os.makedirs(os.path.dirname(self.path_cache_file), exist_ok=True)
+            with open(self.path_cache_file, 'w', encoding='utf-8') as f:
+                json.dump(self.path_cache, f)
+        except OSError as e:
+            print(f"Warning: Could not save path cache: {e}")
+    
     def load_internal_sounds(self):
         """Load internal CS2 sounds from VPK in background thread"""
         if not self.cs2_basefolder:
@@ -336,66 +710,116 @@ class SoundsManagerApp:
                 pak_path = os.path.join(self.cs2_basefolder, 'game', 'csgo', 'pak01_dir.vpk')
                 if not os.path.exists(pak_path):
                     self.log(f"✗ VPK not found at: {pak_path}")
-                    self.loading_internal_sounds = False
+                    self.post_state(loading_internal_sounds=False)
                     return
                 
-                # Open VPK
-                pak = vpk.open(pak_path)
-                
-                # Extract all sound paths
+                # Extract all sound paths in a single pass (only vsnd_c, compiled sounds)
                 sounds = []
-                vsnd_count = 0
-                for filepath in pak:
-                    # Look for vsnd_c files (compiled sounds)
-                    if filepath.endswith('.vsnd_c'):
-                        vsnd_count += 1
-                        # Check if it's in sounds folder (use backslash for Windows paths)
-                        if 'sounds' in filepath.lower():
-                            # Remove .vsnd_c extension for display
-                            sound_path = filepath.replace('.vsnd_c', '')
-                            # Strip "sounds/" prefix to avoid redundant root folder in tree
-                            if sound_path.lower().startswith('sounds/'):
-                                sound_path = sound_path[7:]  # Remove "sounds/" (7 characters)
-                            sounds.append(sound_path)
-                
-                self.internal_sounds = sorted(sounds)
-                self.filtered_internal_sounds = self.internal_sounds
-                self.internal_sounds_loaded = True
-                self.loading_internal_sounds = False
+                append = sounds.append
+                for filepath in read_vpk_paths(pak_path, b'vsnd_c'):
+                    if filepath[:7].lower() == 'sounds/':
+                        # Strip "sounds/" prefix (avoids a redundant root folder in the tree)
+                        append(filepath[7:])
+                    elif 'sounds' in filepath.lower():
+                        append(filepath)
+                
+                sounds.sort()
+                tree = self.build_sounds_tree(sounds)
+                self.post_state(internal_sounds=sounds,
+                                internal_sounds_lower=[sound.lower() for sound in sounds],
+                                filtered_internal_sounds=sounds,
+                                internal_sounds_tree=tree,
+                                filtered_internal_sounds_tree=tree,
+                                internal_sounds_loaded=True,
+                                loading_internal_sounds=False)
                 self.log(f"✓ Loaded {len(sounds)} internal sounds")
                 
             except Exception as e:
                 self.log(f"✗ Error loading internal sounds: {e}")
-                self.loading_internal_sounds = False
+                self.post_state(loading_internal_sounds=False)
         
-        thread = threading.Thread(target=load_thread, daemon=True)
-        thread.start()
+        self.worker_pool.submit(load_thread)
+    
+    def build_sounds_tree(self, sounds):
+        """Build the sorted folder tree for the sound browser ('__files__' holds a folder's (sound, name, label) rows)"""
+        tree = {}
+        for sound in sounds:
+            parts = sound.split('/')
+            current = tree
+            for part in parts[:-1]:  # All but the last (filename)
+                current = current.setdefault(part, {})
+            # Display name and selectable label are derived here once, not per row per frame
+            display_name = parts[-1]
+            current.setdefault('__files__', []).append((sound, display_name, f"  {display_name}###{sound}"))
+        
+        # Order folders and files once here so rendering doesn't have to sort every frame
+        def sort_node(node):
+            files = node.pop('__files__', None)
+            sorted_node = {name: sort_node(node[name]) for name in sorted(node)}
+            if files:
+                sorted_node['__files__'] = sorted(files)
+            return sorted_node
+        
+        return sort_node(tree)
+    
+    def rebuild_flat_tree_rows(self):
+        """Flatten the open folders of the filtered tree into (depth, folder path, label, (sound, name)) rows"""
+        rows = []
+        tree = self.filtered_internal_sounds_tree
+        stack = [(0, "", iter(tree.items()))]
+        while stack:
+            depth, path, items = stack[-1]
+            for name, child in items:
+                if name == '__files__':
+                    rows.extend((depth, None, label, (sound, display_name)) for sound, display_name, label in child)
+                    continue
+                folder_path = f"{path}/{name}" if path else name
+                rows.append((depth, folder_path, f"{name}###{folder_path}", None))
+                if self.folder_open.get(folder_path):
+                    # Descend now, the rest of this folder's items continue after the subtree
+                    stack.append((depth + 1, folder_path, iter(child.items())))
+                    break
+            else:
+                stack.pop()
+        self.flat_tree_rows = rows
+        self.flat_tree_source = tree
     
     def filter_internal_sounds(self, search_text):
         """Filter internal sounds based on search text"""
+        # Same search as the current result (e.g. only the case changed), nothing to redo
+        if search_text.lower() == self.last_internal_search:
+            return
+        
         if not search_text:
             self.filtered_internal_sounds = self.internal_sounds
+            self.filtered_internal_sounds_tree = self.internal_sounds_tree
+            self.last_internal_search = ""
         else:
             search_lower = search_text.lower()
-            self.filtered_internal_sounds = [
-                sound for sound in self.internal_sounds
-                if search_lower in sound.lower()
-            ]
+            # Typing more characters can only narrow the result, so refine the previous matches
+            if self.last_internal_search and search_lower.startswith(self.last_internal_search):
+                candidates = self.filtered_internal_indices
+            else:
+                candidates = range(len(self.internal_sounds))
+            sounds_lower = self.internal_sounds_lower
+            self.filtered_internal_indices = [i for i in candidates if search_lower in sounds_lower[i]]
+            self.last_internal_search = search_lower
+            
+            self.filtered_internal_sounds = [self.internal_sounds[i] for i in self.filtered_internal_indices]
+            self.filtered_internal_sounds_tree = self.build_sounds_tree(self.filtered_internal_sounds)
     
     def cleanup_preview_cache(self, cache_dir, max_files=5, make_room_for_new=False):
         """Keep only the most recent N preview files in cache"""
         try:
-            if not os.path.exists(cache_dir):
-                return
-                
             # Get all files in cache directory (audio files with or without extensions)
-            cache_files = []
+            # as (mtime, path); scandir entries carry their stat info, no per-file syscalls
+            # .analysis.wav waveform copies aren't counted, they are removed with their sound
             try:
-                for f in os.listdir(cache_dir):
-                    file_path = os.path.join(cache_dir, f)
-                    # Only include files (not directories)
-                    if os.path.isfile(file_path):
-                        cache_files.append(file_path)
+                with os.scandir(cache_dir) as entries:
+                    cache_files = [(entry.stat().st_mtime, entry.path) for entry in entries
+                                   if entry.is_file() and not entry.name.endswith('.analysis.wav')]
+            except FileNotFoundError:
+                return
             except Exception as e:
                 print(f"Warning: Could not list cache directory: {e}")
                 return
@@ -415,16 +839,22 @@ class SoundsManagerApp:
             # If we have more than target, delete oldest
             if len(cache_files) > target_count:
                 # Sort by modification time (oldest first)
-                cache_files.sort(key=lambda f: os.path.getmtime(f))
+                cache_files.sort()
                 
                 # Delete oldest files
                 files_to_delete = len(cache_files) - target_count
-                for file_path in cache_files[:files_to_delete]:
+                for _, file_path in cache_files[:files_to_delete]:
                     try:
                         os.remove(file_path)
                         print(f"🗑 Removed old cache: {os.path.basename(file_path)}")
                     except Exception as e:
                         print(f"Warning: Could not delete cache file {file_path}: {e}")
+                    # Sound names can contain dots, only strip the extensions the cache itself adds
+                    sound_root = file_path[:-4] if file_path.endswith(('.wav', '.mp3')) else file_path
+                    try:
+                        os.remove(sound_root + '.analysis.wav')
+                    except OSError:
+                        pass
         except Exception as e:
             print(f"Warning: Cache cleanup failed: {e}")
     
@@ -438,208 +868,210 @@ class SoundsManagerApp:
             self.log("✗ No sound selected for preview")
             return
         
-        # Try to use vsnd_decompiler with .NET Core
-        if self.vsnd_decompiler:
-            try:
-                # Build paths
-                vpk_path = os.path.join(self.cs2_basefolder, 'game', 'csgo', 'pak01_dir.vpk')
-                # The selected sound is stored without "sounds/" prefix, add it back for VPK lookup
-                internal_path = 'sounds/' + self.selected_internal_sound + '.vsnd_c'
-                # Keep forward slashes for VPK (it uses forward slashes internally)
-                internal_path = internal_path.replace('\\', '/')
-                
-                # Create cache directory
-                cache_dir = os.path.join(tempfile.gettempdir(), '.CS2KZ-mapping-tools', 'Sounds', 'preview')
-                os.makedirs(cache_dir, exist_ok=True)
-                
-                # Build output path (decompiler outputs files without extensions)
-                sound_name = os.path.basename(self.selected_internal_sound)
-                output_path = os.path.join(cache_dir, sound_name)
-                
-                # Clean up any old cache files (from previous runs with incorrect logic)
-                # We'll regenerate them with proper MP3→WAV conversion
-                for ext in ['.wav', '.mp3', '']:
-                    old_file = output_path + ext
-                    if os.path.exists(old_file):
-                        try:
-                            # Try to verify if it's a valid WAV by checking conversion timestamp
-                            # For now, just delete and regenerate to ensure consistency
-                            os.remove(old_file)
-                        except:
-                            pass
-                
-                # Clean up old cache files before adding new one (make room for the new file)
-                self.cleanup_preview_cache(cache_dir, max_files=5, make_room_for_new=True)
-                
-                self.log(f"⏳ Decompiling {self.selected_internal_sound}...")
-                
-                # Decompile from VPK
-                decompiled_path = self.vsnd_decompiler.decompile_vsnd(
-                    vpk_path=vpk_path,
-                    internal_sound_path=internal_path,
-                    output_path=output_path
-                )
-                
-                if decompiled_path and os.path.exists(decompiled_path):
-                    # Decompiler outputs MP3 files without extension
-                    # Just rename to .mp3 and use as-is (conversion on-demand during loop playback)
-                    if not os.path.splitext(decompiled_path)[1]:
-                        mp3_path = decompiled_path + '.mp3'
-                        os.rename(decompiled_path, mp3_path)
-                        decompiled_path = mp3_path
-                        self.log(f"    Renamed to .mp3")
-                    
-                    self.cached_internal_sound_path = decompiled_path
-                    self.analyze_audio_file(decompiled_path)  # Analyze for waveform and loop
-                    self.play_sound_file(decompiled_path)
-                else:
-                    self.log("✗ Failed to decompile sound")
-                    self.log("ℹ Internal sound preview requires .NET Desktop Runtime 8.0")
-                    self.log("  Download: https://dotnet.microsoft.com/download/dotnet/8.0")
-                    self.log("  Click 'Download x64' under '.NET Desktop Runtime 8.0'")
-                    self.log("  The sound will still work in-game when you click 'Add Sound'")
-                    
-            except Exception as e:
-                error_str = str(e)
-                if "MemoryMarshal" in error_str or "TypeLoadException" in error_str:
-                    self.log("✗ .NET 8 Desktop Runtime is required for internal sound preview")
-                    self.log("  Download: https://dotnet.microsoft.com/download/dotnet/8.0")
-                    self.log("  Click 'Download x64' under '.NET Desktop Runtime 8.0'")
-                    self.log("  The sound will still work in-game when you click 'Add Sound'")
-                else:
-                    self.log(f"✗ Error previewing sound: {e}")
-                    import traceback
-                    traceback.print_exc()
-        else:
+        if not self.vsnd_decompiler:
             # Fallback message if decompiler not available
             self.log("ℹ Internal sound preview requires .NET Desktop Runtime 8.0")
             self.log("  Download: https://dotnet.microsoft.com/download/dotnet/8.0")
             self.log("  The sound will still work in-game when you click 'Add Sound'")
             self.log(f"  Selected: {self.selected_internal_sound}")
+            return
+        
+        if self.preparing_preview:
+            # A preview still queued behind other work can be swapped out, a running decompile can't
+            if not (self.preview_future and self.preview_future.cancel()):
+                self.log("⏳ Preview is already being prepared")
+                return
+        
+        # Decompiling and converting can take seconds, keep it off the UI thread
+        self.preparing_preview = True
+        self.preview_future = self.worker_pool.submit(self.prepare_internal_preview, self.selected_internal_sound)
     
-    
-    def play_sound_file(self, file_path):
-        """Play audio file using pygame with pitch adjustment and loop points"""
+    def prepare_internal_preview(self, selected_sound):
+        """Decompile (and convert) an internal sound on a worker thread, then hand it to the UI thread to play"""
         try:
-            # Check if it's a large MP3 file (pygame has issues with large MP3s)
-            is_large_mp3 = False
-            actual_play_path = file_path
-            
-            if file_path.lower().endswith('.mp3'):
-                file_size_mb = os.path.getsize(file_path) / (1024 * 1024)
-                if file_size_mb > 5:  # Over 5MB
-                    is_large_mp3 = True
-                    self.log(f"  Large MP3 detected ({file_size_mb:.1f}MB), converting to WAV for playback...")
+            # Build paths
+            vpk_path = os.path.join(self.cs2_basefolder, 'game', 'csgo', 'pak01_dir.vpk')
+            # The selected sound is stored without "sounds/" prefix, add it back for VPK lookup
+            internal_path = 'sounds/' + selected_sound + '.vsnd_c'
+            # Keep forward slashes for VPK (it uses forward slashes internally)
+            internal_path = internal_path.replace('\\', '/')
+            
+            # Create cache directory
+            cache_dir = self.preview_cache_dir
+            os.makedirs(cache_dir, exist_ok=True)
+            
+            # Build output path (decompiler outputs files without extensions)
+            sound_name = os.path.basename(selected_sound)
+            output_path = os.path.join(cache_dir, sound_name)
+            wav_path = output_path + '.wav'
+            analysis_path = output_path + '.analysis.wav'  # 22.05kHz mono copy, only read for the waveform
+            
+            # Replay a previously decoded large sound straight from memory, but only while the cache
+            # file is still the one written for it (a same-named sound from another folder replaces it)
+            cached = self.preview_audio_cache.pop(internal_path, None)
+            if cached:
+                try:
+                    wav_stat = os.stat(wav_path)
+                    file_matches = (wav_stat.st_mtime_ns, wav_stat.st_size) == cached[1]
+                except OSError:
+                    file_matches = False
+                if file_matches:
+                    self.preview_audio_cache[internal_path] = cached
+                    self.post_state(pending_preview=(wav_path, cached[0], analysis_path if os.path.exists(analysis_path) else None))
+                    return
+            
+            # Free this sound's cache names (different folders can share a file name, and the
+            # .mp3 rename below fails on Windows if the target exists); just try, no exists() probe
+            for ext in ('.wav', '.analysis.wav', '.mp3', ''):
+                try:
+                    os.remove(output_path + ext)
+                except OSError:
+                    pass
+            
+            # Clean up old cache files before adding new one (make room for the new file)
+            self.cleanup_preview_cache(cache_dir, max_files=5, make_room_for_new=True)
+            
+            self.log(f"⏳ Decompiling {selected_sound}...")
+            
+            # Decompile from VPK
+            decompiled_path = self.vsnd_decompiler.decompile_vsnd(
+                vpk_path=vpk_path,
+                internal_sound_path=internal_path,
+                output_path=output_path
+            )
+            
+            if decompiled_path and os.path.exists(decompiled_path):
+                # Decompiler outputs MP3 files without extension
+                # Just rename to .mp3 and use as-is (conversion on-demand during loop playback)
+                if not os.path.splitext(decompiled_path)[1]:
+                    mp3_path = decompiled_path + '.mp3'
+                    os.rename(decompiled_path, mp3_path)
+                    decompiled_path = mp3_path
+                    self.log(f"    Renamed to .mp3")
                     
-                    # Check if ffmpeg is available
-                    if not self.ffmpeg_path or not os.path.exists(self.ffmpeg_path):
-                        self.log(f"  ⏳ ffmpeg required for large MP3 conversion, downloading...")
-                        self.download_ffmpeg()
-                        self.log(f"  ℹ Large MP3 will be converted on next preview after ffmpeg download completes")
-                        # For now, skip conversion and let pygame try (will likely fail, but user knows why)
-                        is_large_mp3 = False
-                    else:
-                        try:
-                            from pydub import AudioSegment
-                            
-                            # Explicitly set ffmpeg paths (PATH might not work if pydub was already imported)
-                            ffmpeg_dir = os.path.dirname(self.ffmpeg_path)
-                            ffprobe_path = os.path.join(ffmpeg_dir, 'ffprobe.exe')
-                            AudioSegment.converter = self.ffmpeg_path
-                            AudioSegment.ffprobe = ffprobe_path
-                            
-                            self.log(f"  DEBUG: ffmpeg={self.ffmpeg_path}")
-                            self.log(f"  DEBUG: ffprobe={ffprobe_path}")
-                            self.log(f"  DEBUG: Source MP3={file_path}")
-                            self.log(f"  DEBUG: Source size={os.path.getsize(file_path)} bytes")
-                            
-                            # Stop and unload any current playback to release file locks
-                            try:
-                                pygame.mixer.music.stop()
-                                pygame.mixer.music.unload()
-                            except:
-                                pass
-                            
-                            # Create temp WAV for playback
-                            temp_dir = os.path.join(os.getenv('LOCALAPPDATA'), 'Temp', '.CS2KZ-mapping-tools', 'Sounds', 'temp')
-                            os.makedirs(temp_dir, exist_ok=True)
-                            temp_wav_path = os.path.join(temp_dir, "large_mp3_preview.wav")
+                    # pygame has issues with large MP3s, convert once here instead of on every playback
+                    file_size_mb = os.path.getsize(mp3_path) / (1024 * 1024)
+                    if file_size_mb > 5:
+                        self.log(f"  Large MP3 detected ({file_size_mb:.1f}MB), converting to WAV for playback...")
+                        wav_data = self.decode_mp3_to_wav(mp3_path, analysis_path)
+                        if wav_data:
+                            # Still written once, Add Sound and loop extraction work from the file
+                            with open(wav_path, 'wb') as f:
+                                f.write(wav_data)
+                            os.remove(mp3_path)
+                            decompiled_path = wav_path
                             
-                            self.log(f"  DEBUG: Converting MP3→WAV with ffmpeg directly...")
-                            # Use ffmpeg directly instead of pydub's MP3 decoder (more reliable)
-                            import subprocess
-                            
-                            # Call ffmpeg directly to convert MP3 to WAV
-                            # -i input, -y overwrite, -acodec pcm_s16le standard WAV codec
-                            ffmpeg_cmd = [
-                                self.ffmpeg_path,
-                                '-i', file_path,
-                                '-acodec', 'pcm_s16le',
-                                '-ar', '44100',
-                                '-y',  # Overwrite output
-                                temp_wav_path
-                            ]
-                            
-                            self.log(f"  DEBUG: Running: {' '.join(ffmpeg_cmd)}")
-                            result = subprocess.run(ffmpeg_cmd, capture_output=True, text=True, creationflags=subprocess.CREATE_NO_WINDOW if hasattr(subprocess, 'CREATE_NO_WINDOW') else 0)
-                            
-                            if result.returncode != 0:
-                                self.log(f"  DEBUG: ffmpeg stderr: {result.stderr}")
-                                raise Exception(f"ffmpeg failed with code {result.returncode}")
-                            
-                            wav_size = os.path.getsize(temp_wav_path) if os.path.exists(temp_wav_path) else 0
-                            self.log(f"  DEBUG: WAV created, size={wav_size} bytes")
-                            
-                            actual_play_path = temp_wav_path
-                            self.log(f"  ✓ Converted to WAV for playback")
-                        except Exception as e:
-                            self.log(f"  ✗ Conversion failed: {e}")
-                            import traceback
-                            self.log(f"  Traceback: {traceback.format_exc()}")
-                            is_large_mp3 = False
-            
-            # Reinitialize mixer to ensure clean state
+                            # Keep only the most recent few decoded sounds in memory
+                            wav_stat = os.stat(wav_path)
+                            self.preview_audio_cache[internal_path] = (wav_data, (wav_stat.st_mtime_ns, wav_stat.st_size))
+                            while len(self.preview_audio_cache) > 5:
+                                del self.preview_audio_cache[next(iter(self.preview_audio_cache))]
+                
+                # Playback (mixer) and timeline analysis happen back on the UI thread
+                self.post_state(pending_preview=(decompiled_path, wav_data, analysis_path if os.path.exists(analysis_path) else None))
+            else:
+                self.log("✗ Failed to decompile sound")
+                self.log("ℹ Internal sound preview requires .NET Desktop Runtime 8.0")
+                self.log("  Download: https://dotnet.microsoft.com/download/dotnet/8.0")
+                self.log("  Click 'Download x64' under '.NET Desktop Runtime 8.0'")
+                self.log("  The sound will still work in-game when you click 'Add Sound'")
+                
+        except Exception as e:
+            error_str = str(e)
+            if "MemoryMarshal" in error_str or "TypeLoadException" in error_str:
+                self.log("✗ .NET 8 Desktop Runtime is required for internal sound preview")
+                self.log("  Download: https://dotnet.microsoft.com/download/dotnet/8.0")
+                self.log("  Click 'Download x64' under '.NET Desktop Runtime 8.0'")
+                self.log("  The sound will still work in-game when you click 'Add Sound'")
+            else:
+                self.log(f"✗ Error previewing sound: {e}")
+                import traceback
+                traceback.print_exc()
+        finally:
+            self.post_state(preparing_preview=False)
+    
+    def start_pending_preview(self):
+        """Analyze and play a preview prepared by prepare_internal_preview (UI thread)"""
+        file_path, audio_data, analysis_path = self.pending_preview
+        self.pending_preview = None
+        self.cached_internal_sound_path = file_path
+        self.analyze_audio_file(analysis_path or file_path)  # Analyze for waveform and loop
+        self.play_sound_file(file_path, audio_data)
+    
+    def decode_mp3_to_wav(self, mp3_path, analysis_path=None):
+        """Decode an MP3 to 16-bit 44.1kHz WAV bytes with ffmpeg (piped, no temp file), returns None on failure
+        
+        If analysis_path is given the same ffmpeg run also writes a 22.05kHz mono WAV there for the waveform.
+        """
+        if not self.ffmpeg_path:
+            self.log(f"  ⏳ ffmpeg required for large MP3 conversion, downloading...")
+            self.post_state(ffmpeg_download_requested=True)
+            self.log(f"  ℹ Large MP3 will be converted on next preview after ffmpeg download completes")
+            return None
+        
+        try:
+            # -f wav to stdout ('-'), -acodec pcm_s16le standard WAV codec
+            ffmpeg_cmd = [
+                self.ffmpeg_path,
+                '-y',  # Overwrite output
+                '-i', mp3_path,
+                '-map', '0:a',
+                '-f', 'wav',
+                '-acodec', 'pcm_s16le',
+                '-ar', '44100',
+                '-'
+            ]
+            if analysis_path:
+                # Visualizer doesn't need full rate stereo, half the samples to read back
+                ffmpeg_cmd += ['-map', '0:a', '-acodec', 'pcm_s16le', '-ar', '22050', '-ac', '1', analysis_path]
+            proc = subprocess.Popen(ffmpeg_cmd, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.PIPE, creationflags=SUBPROCESS_FLAGS)
+            wav_data, stderr = proc.communicate()
+            
+            if proc.returncode != 0 or not wav_data:
+                self.log(f"  ffmpeg stderr: {stderr.decode(errors='replace')}")
+                raise Exception(f"ffmpeg failed with code {proc.returncode}")
+            wav_data = fix_piped_wav_header(wav_data)
+            
+            self.log(f"  ✓ Converted to WAV for playback")
+            return wav_data
+        except FileNotFoundError:
+            # ffmpeg was deleted since it was found, forget it so the next use downloads it again
+            self.log(f"  ✗ Conversion failed: ffmpeg not found at {self.ffmpeg_path}")
+            self.post_state(ffmpeg_path=None)
+            return None
+        except Exception as e:
+            self.log(f"  ✗ Conversion failed: {e}")
+            return None
+    
+    def play_sound_file(self, file_path, audio_data=None):
+        """Play audio file using pygame with pitch adjustment and loop points (from audio_data WAV bytes if given)"""
+        try:
             if not pygame:
                 self.log("✗ pygame not available. Install with: pip install pygame")
                 return
             
-            pygame.mixer.quit()
-            
-            # If pitch toggle is enabled and pitch != 1.0, adjust frequency
-            # Standard frequency is 44100 Hz
-            base_frequency = 44100
+            self.init_preview_mixer()
             
-            if self.show_pitch and self.pitch != 1.0:
-                # Change playback frequency to simulate pitch
-                # Lower frequency = lower pitch, higher frequency = higher pitch
-                # We need to load at normal rate but play at adjusted rate
-                adjusted_frequency = int(base_frequency / self.pitch)
-                # Clamp frequency to reasonable values (8000 Hz to 48000 Hz)
-                adjusted_frequency = max(8000, min(48000, adjusted_frequency))
+            # Decoded audio already in memory skips reading the file back from disk
+            if audio_data:
+                pygame.mixer.music.load(io.BytesIO(audio_data), 'wav')
             else:
-                adjusted_frequency = base_frequency
-            
-            pygame.mixer.init(frequency=adjusted_frequency, size=-16, channels=2, buffer=512)
+                pygame.mixer.music.load(file_path)
+            pygame.mixer.music.set_volume(self.preview_volume)
             
             # If loop is enabled and we have loop points, use pygame.mixer.Sound for better control
             if self.encoding_loop_enabled and self.audio_duration_ms > 0 and self.encoding_loop_start_ms > 0:
                 # Note: pygame.mixer.Sound doesn't support seeking either, but we can
                 # at least set the playback position by using set_volume fade-in effect
                 # For now, we'll just play from the beginning and show a message
-                pygame.mixer.music.load(actual_play_path)
-                pygame.mixer.music.set_volume(self.preview_volume)
                 pygame.mixer.music.play(-1, start=self.encoding_loop_start_ms / 1000.0)  # Start position in seconds
                 loop_msg = f" (looping from {self.encoding_loop_start_ms/1000:.2f}s to {self.encoding_loop_end_ms/1000:.2f}s)"
             elif self.encoding_loop_enabled and self.audio_duration_ms > 0:
                 # Loop from beginning
-                pygame.mixer.music.load(actual_play_path)
-                pygame.mixer.music.set_volume(self.preview_volume)
                 pygame.mixer.music.play(-1)  # -1 means loop indefinitely
                 loop_msg = f" (looping: {self.encoding_loop_start_ms/1000:.2f}s - {self.encoding_loop_end_ms/1000:.2f}s)"
             else:
                 # Normal playback
-                pygame.mixer.music.load(actual_play_path)
-                pygame.mixer.music.set_volume(self.preview_volume)
                 pygame.mixer.music.play()
                 loop_msg = ""
             
@@ -659,6 +1091,44 @@ class SoundsManagerApp:
                 pygame.mixer.init()
             except:
                 pass
+            self.mixer_frequency = None
+    
+    def ensure_mixer(self):
+        """Open the pygame mixer on first use, returns False if audio is unavailable"""
+        if not pygame:
+            return False
+        if pygame.mixer.get_init():
+            return True
+        try:
+            self.init_preview_mixer()
+            return True
+        except Exception as e:
+            self.log(f"✗ pygame mixer initialization failed: {e}")
+            return False
+    
+    def init_preview_mixer(self):
+        """(Re)initialize the mixer for the current pitch, skipped when the frequency is unchanged"""
+        # If pitch toggle is enabled and pitch != 1.0, adjust frequency
+        # Standard frequency is 44100 Hz
+        base_frequency = 44100
+        
+        if self.show_pitch and self.pitch != 1.0:
+            # Change playback frequency to simulate pitch
+            # Lower frequency = lower pitch, higher frequency = higher pitch
+            # We need to load at normal rate but play at adjusted rate
+            adjusted_frequency = int(base_frequency / self.pitch)
+            # Clamp frequency to reasonable values (8000 Hz to 48000 Hz)
+            adjusted_frequency = max(8000, min(48000, adjusted_frequency))
+        else:
+            adjusted_frequency = base_frequency
+        
+        # Re-init tears down the audio device (slow, audible click), only do it when needed
+        if adjusted_frequency == self.mixer_frequency and pygame.mixer.get_init():
+            return
+        
+        pygame.mixer.quit()
+        pygame.mixer.init(frequency=adjusted_frequency, size=-16, channels=2, buffer=2048)
+        self.mixer_frequency = adjusted_frequency
     
     def play_sound(self):
         """Play the currently selected sound (custom or internal)"""
@@ -671,21 +1141,14 @@ class SoundsManagerApp:
     
     def stop_sound(self):
         """Stop currently playing sound"""
-        if not pygame:
+        if not pygame or not pygame.mixer.get_init():
             return
         try:
             pygame.mixer.music.stop()
             pygame.mixer.music.unload()  # Unload the file to release the lock
             self.preview_playing = False
             
-            # Clean up temporary loop preview file if it exists
-            if self.temp_loop_file and os.path.exists(self.temp_loop_file):
-                try:
-                    os.remove(self.temp_loop_file)
-                    self.temp_loop_file = None
-                except:
-                    pass  # File might be in use, will be cleaned up on next run
-            
+            # The rendered loop preview is kept so replaying the same region skips the export
             self.log("⏹ Stopped playback")
         except Exception as e:
             self.log(f"✗ Error stopping sound: {e}")
@@ -698,23 +1161,19 @@ class SoundsManagerApp:
         if not audio_path or not self.encoding_loop_enabled:
             return
         
-        # Check if it's a WAV file - we can use pydub for WAV without ffmpeg
-        is_wav = audio_path.lower().endswith('.wav')
+        # Replaying an unchanged loop region reuses the already rendered preview
+        try:
+            render_key = (audio_path, os.path.getmtime(audio_path), self.encoding_loop_start_ms, self.encoding_loop_end_ms)
+        except OSError:
+            render_key = None
+        reuse_render = render_key is not None and render_key == self.loop_render_key
         
-        # Try to detect if file without extension is WAV
-        if not is_wav and not audio_path.lower().endswith('.mp3'):
-            try:
-                import wave
-                with wave.open(audio_path, 'rb') as test_wav:
-                    is_wav = True
-            except:
-                is_wav = False
+        # Check if it's a WAV file - the loop region can be cut straight from the PCM without ffmpeg
+        is_wav = self.detect_wav(audio_path)
         
-        # For WAV files, use pydub to extract loop region
+        # For WAV files, copy the loop region's frames into a small WAV
         if is_wav:
             try:
-                from pydub import AudioSegment
-                
                 # Stop and unload any current playback to release file locks
                 try:
                     pygame.mixer.music.stop()
@@ -722,43 +1181,36 @@ class SoundsManagerApp:
                 except:
                     pass
                 
-                # Load audio with pydub
-                audio = AudioSegment.from_wav(audio_path)
-                
-                # Extract loop region
-                loop_segment = audio[self.encoding_loop_start_ms:self.encoding_loop_end_ms]
-                
-                # Clean up old temp file if it exists (now that file is unlocked)
-                if self.temp_loop_file and os.path.exists(self.temp_loop_file):
-                    try:
-                        os.remove(self.temp_loop_file)
-                    except:
-                        pass
-                
-                # Create a temporary file for the loop in our app-specific temp folder
-                temp_dir = os.path.join(os.getenv('LOCALAPPDATA'), 'Temp', '.CS2KZ-mapping-tools')
-                os.makedirs(temp_dir, exist_ok=True)
-                temp_loop_path = os.path.join(temp_dir, "cs2_sound_loop_preview.wav")
-                self.temp_loop_file = temp_loop_path
-                
-                # Export loop segment (repeat it a few times so it actually loops)
-                looped_audio = loop_segment * 10  # Repeat 10 times
-                looped_audio.export(temp_loop_path, format="wav")
-                
-                # Reinitialize mixer
-                pygame.mixer.quit()
-                base_frequency = 44100
+                if not (reuse_render and self.temp_loop_file and os.path.exists(self.temp_loop_file)):
+                    self.loop_render_key = None
+                    self.loop_render_data = None
+                    
+                    # Extract loop region (only its frames are read)
+                    with wave.open(audio_path, 'rb') as wav_file:
+                        loop_params = wav_file.getparams()
+                        n_frames = wav_file.getnframes()
+                        start_frame = min(int(self.encoding_loop_start_ms * loop_params.framerate / 1000), n_frames)
+                        end_frame = min(int(self.encoding_loop_end_ms * loop_params.framerate / 1000), n_frames)
+                        wav_file.setpos(start_frame)
+                        loop_frames = wav_file.readframes(max(end_frame - start_frame, 0))
                 
-                if self.show_pitch and self.pitch != 1.0:
-                    adjusted_frequency = int(base_frequency / self.pitch)
-                    adjusted_frequency = max(8000, min(48000, adjusted_frequency))
-                else:
-                    adjusted_frequency = base_frequency
+                    # Create a temporary file for the loop in our app-specific temp folder
+                    temp_loop_path = self.loop_preview_path
+                    os.makedirs(os.path.dirname(temp_loop_path), exist_ok=True)
+                    
+                    # Export the loop region once, the mixer repeats it with play(-1)
+                    # Written under a temporary name and swapped in, so the old preview is replaced atomically
+                    with wave.open(temp_loop_path + '.new', 'wb') as loop_file:
+                        loop_file.setparams(loop_params)
+                        loop_file.writeframes(loop_frames)
+                    os.replace(temp_loop_path + '.new', temp_loop_path)
+                    self.temp_loop_file = temp_loop_path
+                    self.loop_render_key = render_key
                 
-                pygame.mixer.init(frequency=adjusted_frequency, size=-16, channels=2, buffer=512)
+                self.init_preview_mixer()
                 
                 # Load and play the looped segment
-                pygame.mixer.music.load(temp_loop_path)
+                pygame.mixer.music.load(self.temp_loop_file)
                 pygame.mixer.music.set_volume(self.preview_volume)
                 pygame.mixer.music.play(-1)  # Loop continuously
                 
@@ -770,189 +1222,182 @@ class SoundsManagerApp:
             except Exception as e:
                 self.log(f"✗ Error playing loop region: {e}")
         else:
-            # For MP3 files, try to extract loop with ffmpeg if available
-            if self.ffmpeg_path and os.path.exists(self.ffmpeg_path):
+            # For MP3 files, decode once (ffmpeg if installed, otherwise SDL_mixer) and loop the exact region from memory
+            try:
+                # Stop and unload any current playback
                 try:
-                    # Also check ffprobe path (pydub needs both)
-                    ffmpeg_dir = os.path.dirname(self.ffmpeg_path)
-                    ffprobe_path = os.path.join(ffmpeg_dir, 'ffprobe.exe')
-                    
-                    # Verify both exist before configuring
-                    if not os.path.exists(ffprobe_path):
-                        self.log(f"✗ ffprobe.exe not found at: {ffprobe_path}")
-                        self.log(f"ℹ Please download ffmpeg + ffprobe")
-                        return
-                    
-                    # Configure pydub BEFORE importing AudioSegment
-                    # This ensures pydub uses our custom paths
-                    from pydub import AudioSegment
-                    from pydub.utils import which
-                    
-                    # Override the paths
-                    AudioSegment.converter = self.ffmpeg_path
-                    AudioSegment.ffprobe = ffprobe_path
-                    
-                    # Also set as environment to ensure subprocess can find them
-                    import os as os_module
-                    ffmpeg_dir_for_path = os.path.dirname(self.ffmpeg_path)
-                    if 'PATH' in os_module.environ:
-                        os_module.environ['PATH'] = ffmpeg_dir_for_path + os.pathsep + os_module.environ['PATH']
-                    else:
-                        os_module.environ['PATH'] = ffmpeg_dir_for_path
-                    
-                    self.log(f"DEBUG: Using ffmpeg: {self.ffmpeg_path}")
-                    self.log(f"DEBUG: Using ffprobe: {ffprobe_path}")
-                    self.log(f"DEBUG: Added to PATH: {ffmpeg_dir_for_path}")
-                    
-                    # Stop and unload any current playback
-                    try:
-                        pygame.mixer.music.stop()
-                        pygame.mixer.music.unload()
-                    except:
-                        pass
-                    
-                    self.log(f"    Extracting loop segment with ffmpeg...")
-                    
-                    # Clean up old temp file
-                    if self.temp_loop_file and os.path.exists(self.temp_loop_file):
-                        try:
-                            os.remove(self.temp_loop_file)
-                        except:
-                            pass
-                    
-                    # Create temp file for loop
-                    temp_dir = os.path.join(os.getenv('LOCALAPPDATA'), 'Temp', '.CS2KZ-mapping-tools', 'Sounds', 'temp')
-                    os.makedirs(temp_dir, exist_ok=True)
-                    temp_loop_path = os.path.join(temp_dir, "cs2_sound_loop_preview.wav")
-                    self.temp_loop_file = temp_loop_path
-                    
-                    # Use ffmpeg directly to extract and loop the segment
-                    # Convert ms to seconds for ffmpeg
-                    loop_start_sec = self.encoding_loop_start_ms / 1000.0
-                    loop_duration_sec = (self.encoding_loop_end_ms - self.encoding_loop_start_ms) / 1000.0
-                    
-                    # Extract loop segment and repeat it 10 times using ffmpeg
-                    # -stream_loop must come BEFORE -i (input option, not output option)
-                    # -ss start time, -t duration
-                    import subprocess
-                    ffmpeg_cmd = [
-                        self.ffmpeg_path,
-                        '-ss', str(loop_start_sec),
-                        '-t', str(loop_duration_sec),
-                        '-stream_loop', '9',  # Loop 9 times = 10 total plays (must be before -i)
-                        '-i', audio_path,
-                        '-acodec', 'pcm_s16le',
-                        '-ar', '44100',
-                        '-y',
-                        temp_loop_path
-                    ]
-                    
-                    result = subprocess.run(ffmpeg_cmd, capture_output=True, text=True, creationflags=subprocess.CREATE_NO_WINDOW if hasattr(subprocess, 'CREATE_NO_WINDOW') else 0)
-                    
-                    if result.returncode != 0:
-                        self.log(f"  ffmpeg stderr: {result.stderr}")
-                        raise Exception(f"ffmpeg loop extraction failed with code {result.returncode}")
-                    
-                    # Reinitialize mixer and play
-                    pygame.mixer.quit()
-                    base_frequency = 44100
-                    
-                    if self.show_pitch and self.pitch != 1.0:
-                        adjusted_frequency = int(base_frequency / self.pitch)
-                        adjusted_frequency = max(8000, min(48000, adjusted_frequency))
-                    else:
-                        adjusted_frequency = base_frequency
-                    
-                    pygame.mixer.init(frequency=adjusted_frequency, size=-16, channels=2, buffer=512)
+                    pygame.mixer.music.stop()
+                    pygame.mixer.music.unload()
+                except:
+                    pass
+                
+                if not (reuse_render and self.loop_render_data):
+                    self.loop_render_key = None
+                    self.loop_render_data = None
                     
-                    pygame.mixer.music.load(temp_loop_path)
+                    # Loop edits only re-slice the PCM decoded on the first play of this file
+                    source = self.decoded_loop_source(audio_path)
+                    if source:
+                        n_channels, framerate, sampwidth, pcm = source
+                        frame_bytes = n_channels * sampwidth
+                        start = int(self.encoding_loop_start_ms * framerate / 1000) * frame_bytes
+                        end = int(self.encoding_loop_end_ms * framerate / 1000) * frame_bytes
+                        self.loop_render_data = pcm_to_wav(pcm[start:end], n_channels, framerate, sampwidth)
+                        self.loop_render_key = render_key
+                
+                self.init_preview_mixer()
+                
+                if self.loop_render_data:
+                    pygame.mixer.music.load(io.BytesIO(self.loop_render_data), 'wav')
                     pygame.mixer.music.set_volume(self.preview_volume)
                     pygame.mixer.music.play(-1)
-                    
-                    self.preview_playing = True
-                    self.playback_position_ms = int(self.encoding_loop_start_ms)
-                    self.playback_start_time = pygame.time.get_ticks()
-                    
-                    self.log(f"♪ Playing loop: {self.encoding_loop_start_ms/1000:.2f}s - {self.encoding_loop_end_ms/1000:.2f}s")
-                except Exception as e:
-                    self.log(f"✗ Error extracting MP3 loop: {e}")
-                    import traceback
-                    traceback.print_exc()
-            else:
-                # Fallback: simple playback from start position
-                try:
-                    pygame.mixer.quit()
-                    base_frequency = 44100
-                    
-                    if self.show_pitch and self.pitch != 1.0:
-                        adjusted_frequency = int(base_frequency / self.pitch)
-                        adjusted_frequency = max(8000, min(48000, adjusted_frequency))
-                    else:
-                        adjusted_frequency = base_frequency
-                    
-                    pygame.mixer.init(frequency=adjusted_frequency, size=-16, channels=2, buffer=512)
-                    
-                    # Load and play from loop start position
+                else:
+                    # Fallback if the MP3 couldn't be decoded: simple playback from start position
                     pygame.mixer.music.load(audio_path)
                     pygame.mixer.music.set_volume(self.preview_volume)
                     loop_start_sec = self.encoding_loop_start_ms / 1000.0
                     pygame.mixer.music.play(-1, start=loop_start_sec)
-                    
-                    self.preview_playing = True
-                    self.playback_position_ms = int(self.encoding_loop_start_ms)
-                    self.playback_start_time = pygame.time.get_ticks()
-                    
-                    self.log(f"♪ Playing loop: {self.encoding_loop_start_ms/1000:.2f}s - {self.encoding_loop_end_ms/1000:.2f}s")
-                    self.log(f"ℹ MP3 loops play from start point to end of file (download ffmpeg for exact loops)")
-                except Exception as e:
-                    self.log(f"✗ Error playing loop region: {e}")
+                    self.log(f"ℹ MP3 loop plays from start point to end of file (could not decode the exact region)")
+                
+                self.preview_playing = True
+                self.playback_position_ms = int(self.encoding_loop_start_ms)
+                self.playback_start_time = pygame.time.get_ticks()
+                
+                self.log(f"♪ Playing loop: {self.encoding_loop_start_ms/1000:.2f}s - {self.encoding_loop_end_ms/1000:.2f}s")
+            except Exception as e:
+                self.log(f"✗ Error playing loop region: {e}")
+                import traceback
+                traceback.print_exc()
     
-    def analyze_audio_file(self, file_path):
-        """Analyze audio file to extract duration and generate waveform data"""
+    def decoded_loop_source(self, audio_path):
+        """Full PCM of an MP3 for loop previews as (channels, rate, sample width, pcm), decoded once per file"""
         try:
-            import wave
-            import struct
-            
-            # Reset timeline data
-            self.audio_duration_ms = 0
-            self.audio_waveform = []
-            self.encoding_loop_start_ms = 0
-            self.encoding_loop_end_ms = 0
-            self.playback_position_ms = 0
-            
-            # Try to detect file type (some decompiled files have no extension)
-            is_mp3 = file_path.lower().endswith('.mp3')
-            is_wav = file_path.lower().endswith('.wav')
-            
-            # If no extension, try to detect by attempting to open as WAV first
-            if not is_mp3 and not is_wav:
-                try:
-                    with wave.open(file_path, 'rb') as test_wav:
-                        is_wav = True
-                except:
-                    is_mp3 = True  # Assume MP3 if WAV fails
+            source_key = (audio_path, os.path.getmtime(audio_path))
+        except OSError:
+            return None
+        if self.loop_source and self.loop_source[0] == source_key:
+            return self.loop_source[1]
+        
+        self.loop_source = None  # Release the previous file's PCM before decoding the next
+        if self.ffmpeg_path:
+            self.log(f"    Decoding MP3 with ffmpeg for loop preview...")
+            wav_data = self.decode_mp3_to_wav(audio_path)
+            if not wav_data:
+                return None
+            
+            with wave.open(io.BytesIO(wav_data), 'rb') as wav_file:
+                source = (wav_file.getnchannels(), wav_file.getframerate(), wav_file.getsampwidth(),
+                          memoryview(wav_file.readframes(wav_file.getnframes())))
+        else:
+            # No ffmpeg - SDL_mixer decodes the MP3 itself, samples come out in the mixer's format
+            if not self.ensure_mixer():
+                return None
+            try:
+                # Bring the mixer to the rate it will play at first, get_init() then reports the decode format
+                self.init_preview_mixer()
+                frequency, size, channels = pygame.mixer.get_init()
+                source = (channels, frequency, abs(size) // 8, memoryview(pygame.mixer.Sound(audio_path).get_raw()))
+            except Exception as e:
+                self.log(f"✗ Error decoding MP3 for loop preview: {e}")
+                return None
+        self.loop_source = (source_key, source)
+        return source
+    
+    def analyze_audio_file(self, file_path, background=False):
+        """Analyze audio file to extract duration and generate waveform data (decoded on a worker if background)"""
+        # Drop any analysis still running for a previously selected file
+        if self.analysis_future:
+            self.analysis_future.cancel()
+            self.analysis_future = None
+        
+        # Reset timeline data
+        self.audio_duration_ms = 0
+        self.audio_waveform = []
+        self.encoding_loop_start_ms = 0
+        self.encoding_loop_end_ms = 0
+        self.playback_position_ms = 0
+        
+        # Reselecting an unchanged file reuses its duration and waveform
+        try:
+            stat = os.stat(file_path)
+            cache_key = (file_path, stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            cache_key = None
+        cached = self.waveform_cache.get(cache_key)
+        if cached:
+            self.waveform_cache.move_to_end(cache_key)
+            return self.apply_audio_analysis(None, cached)
+        
+        # MP3 duration comes from pygame.mixer.Sound, open the mixer here on the UI thread
+        if not file_path.lower().endswith('.wav'):
+            self.ensure_mixer()
+        
+        if background:
+            # The timeline stays hidden (duration 0) until the worker finishes
+            self.analysis_key = cache_key
+            self.analysis_future = self.worker_pool.submit(self.measure_audio_file, file_path)
+            self.analysis_future.add_done_callback(lambda future: self.wake_ui())
+            return True
+        return self.apply_audio_analysis(cache_key, self.measure_audio_file(file_path))
+    
+    def detect_wav(self, file_path):
+        """Whether a file is WAV, extensionless decompiled files are probed once and remembered"""
+        lower_path = file_path.lower()
+        if lower_path.endswith('.wav'):
+            return True
+        if lower_path.endswith('.mp3'):
+            return False
+        is_wav = self.wav_detection.get(file_path)
+        if is_wav is None:
+            try:
+                with wave.open(file_path, 'rb'):
+                    is_wav = True
+            except Exception:
+                is_wav = False
+            self.wav_detection[file_path] = is_wav
+        return is_wav
+    
+    def apply_audio_analysis(self, cache_key, result):
+        """Show a (duration_ms, waveform) analysis result on the timeline and cache it (UI thread)"""
+        if not result:
+            return False
+        self.audio_duration_ms, self.audio_waveform = result
+        self.waveform_dirty = True
+        self.encoding_loop_end_ms = self.audio_duration_ms
+        if cache_key:
+            self.waveform_cache[cache_key] = result
+            while len(self.waveform_cache) > 16:
+                self.waveform_cache.popitem(last=False)
+        return True
+    
+    def measure_audio_file(self, file_path):
+        """Decode duration and waveform peaks, returns (duration_ms, waveform) or None (safe to call from worker threads)"""
+        try:
+            # Try to detect file type (some decompiled files have no extension, assume MP3 if not WAV)
+            is_wav = self.detect_wav(file_path)
+            is_mp3 = not is_wav
             
             # Check file extension
             if is_mp3:
                 # For MP3, just get duration with pygame (no conversion for UI responsiveness)
                 try:
+                    if not pygame or not pygame.mixer.get_init():
+                        return None
                     sound = pygame.mixer.Sound(file_path)
                     duration_seconds = sound.get_length()
-                    self.audio_duration_ms = int(duration_seconds * 1000)
-                    self.encoding_loop_end_ms = self.audio_duration_ms
                     
                     # Generate simple waveform placeholder for MP3s
                     # Actual waveform would require conversion which blocks UI
                     num_samples = 200
-                    # Create a semi-random looking waveform (alternating between 0.2-0.5)
-                    import random
-                    random.seed(hash(file_path))  # Consistent per file
-                    self.audio_waveform = [random.uniform(0.2, 0.5) for _ in range(num_samples)]
+                    # Create a semi-random looking waveform (between 0.2-0.5), seeded from the path so
+                    # it's the same for a file across runs (str hash() is randomized per process)
+                    rng = np.random.default_rng(zlib.crc32(file_path.encode('utf-8')))
+                    waveform = rng.uniform(0.2, 0.5, num_samples).tolist()
                     
                     self.log(f"✓ Analyzed MP3: {duration_seconds:.2f}s (approximate waveform)")
                 except Exception as e:
                     self.log(f"✗ Error analyzing MP3: {e}")
-                    return False
+                    return None
                     
             elif is_wav:
                 # For WAV, use wave module to extract detailed data
@@ -960,60 +1405,24 @@ class SoundsManagerApp:
                     framerate = wav_file.getframerate()
                     n_frames = wav_file.getnframes()
                     n_channels = wav_file.getnchannels()
-                    sampwidth = wav_file.getsampwidth()
                     
                     # Calculate duration
                     duration_seconds = n_frames / framerate
-                    self.audio_duration_ms = int(duration_seconds * 1000)
-                    self.encoding_loop_end_ms = self.audio_duration_ms
                     
-                    # Read all frames
-                    frames = wav_file.readframes(n_frames)
-                    
-                    # Convert to samples
-                    if sampwidth == 1:
-                        fmt = f"{n_frames * n_channels}B"
-                        samples = struct.unpack(fmt, frames)
-                        samples = [(s - 128) / 128.0 for s in samples]
-                    elif sampwidth == 2:
-                        fmt = f"{n_frames * n_channels}h"
-                        samples = struct.unpack(fmt, frames)
-                        samples = [s / 32768.0 for s in samples]
-                    else:
-                        # Unsupported sample width, use placeholder
-                        samples = [0.5] * (n_frames * n_channels)
-                    
-                    # If stereo, average channels
-                    if n_channels == 2:
-                        samples = [(samples[i] + samples[i+1]) / 2 for i in range(0, len(samples), 2)]
-                    
-                    # Downsample for visualization (200 points)
-                    num_vis_samples = 200
-                    chunk_size = max(1, len(samples) // num_vis_samples)
-                    
-                    self.audio_waveform = []
-                    for i in range(num_vis_samples):
-                        start_idx = i * chunk_size
-                        end_idx = min(start_idx + chunk_size, len(samples))
-                        if start_idx < len(samples):
-                            chunk = samples[start_idx:end_idx]
-                            # Get peak amplitude in this chunk (max absolute value)
-                            peak = max(abs(s) for s in chunk) if chunk else 0.0
-                            self.audio_waveform.append(peak)
-                        else:
-                            self.audio_waveform.append(0.0)
+                    # Downsample for visualization (one peak per timeline pixel)
+                    waveform = wav_waveform_peaks(wav_file, self.timeline_width, file_path).tolist()
                     
                     self.log(f"✓ Analyzed WAV: {duration_seconds:.2f}s, {framerate}Hz, {n_channels}ch")
             else:
-                return False
+                return None
                 
-            return True
+            return int(duration_seconds * 1000), waveform
             
         except Exception as e:
             self.log(f"✗ Error analyzing audio: {e}")
             import traceback
             traceback.print_exc()
-            return False
+            return None
     
     def update_addon_filter(self, search_text):
         """Filter available addons based on search text"""
@@ -1029,17 +1438,54 @@ class SoundsManagerApp:
         self.selected_addon_index = -1
     
     def log(self, message):
-        """Add message to console output"""
-        self.console_output.append(message)
+        """Add message to console output (safe to call from worker threads)"""
+        self.ui_queue.put_nowait(('log', message))
+        self.wake_ui()
         print(message)
     
+    def post_state(self, **updates):
+        """Queue attribute updates from a worker thread, applied on the UI thread"""
+        self.ui_queue.put_nowait(('state', updates))
+        self.wake_ui()
+    
+    def wake_ui(self):
+        """Wake the render loop if it is blocked waiting for events"""
+        if self.window:
+            glfw.post_empty_event()
+    
+    def needs_fast_refresh(self):
+        """Whether something on screen is animating and needs continuous redraws"""
+        return (self.preview_playing or self.loading_internal_sounds or self.downloading_ffmpeg
+                or self.dragging_loop_start or self.dragging_loop_end)
+    
+    def process_ui_queue(self, max_items=256):
+        """Drain log lines and state updates posted by worker threads, returns True if any"""
+        processed = False
+        for _ in range(max_items):
+            try:
+                kind, payload = self.ui_queue.get_nowait()
+            except queue.Empty:
+                break
+            processed = True
+            if kind == 'log':
+                self.console_output.append(payload)
+            elif kind == 'state':
+                for name, value in payload.items():
+                    setattr(self, name, value)
+        return processed
+    
+    def get_tk_root(self):
+        """Hidden Tk root shared by all dialogs, created on first use"""
+        if self.tk_root is None:
+            self.tk_root = tk.Tk()
+            self.tk_root.withdraw()
+            self.tk_root.attributes('-topmost', True)
+        return self.tk_root
+    
     def browse_sound_file(self):
         """Open file dialog to select sound file"""
-        root = tk.Tk()
-        root.withdraw()
-        root.attributes('-topmost', True)
-        
         file_path = filedialog.askopenfilename(
+            parent=self.get_tk_root(),
             title="Select Sound File",
             filetypes=[
                 ("Audio Files", "*.mp3 *.wav"),
@@ -1048,7 +1494,6 @@ class SoundsManagerApp:
                 ("All Files", "*.*")
             ]
         )
-        root.destroy()
         
         if file_path:
             self.sound_file_path = file_path.replace("\\", "/")
@@ -1058,12 +1503,12 @@ class SoundsManagerApp:
             self.sound_name = os.path.splitext(filename)[0]
             # Set default output name to match the input filename
             self.output_name = self.sound_name
-            self.sound_status_color = (0.0, 1.0, 0.0, 1.0)  # Green
+            self.sound_status_color = STATUS_GREEN
             self.log(f"✓ Selected: {self.sound_file_display}")
             self.log(f"  Sound name: {self.sound_name}")
             
-            # Analyze audio file for timeline
-            self.analyze_audio_file(file_path)
+            # Analyze audio file for timeline (decoded on a worker, long WAVs take a while)
+            self.analyze_audio_file(file_path, background=True)
         else:
             self.log("✗ No file selected")
     
@@ -1084,28 +1529,31 @@ class SoundsManagerApp:
             # Download the ZIP file
             url = "https://www.rarewares.org/files/mp3/lame3.100.1-x64.zip"
             
-            with urllib.request.urlopen(url, timeout=30) as response:
-                zip_data = response.read()
-            
-            # Extract only lame_enc.dll from the ZIP (don't keep anything else)
-            with zipfile.ZipFile(io.BytesIO(zip_data)) as zip_file:
-                # Find lame_enc.dll in the ZIP
-                dll_found = False
-                for file_info in zip_file.namelist():
-                    if file_info.endswith('lame_enc.dll'):
-                        # Extract directly to the target location (memory -> file)
-                        # This avoids extracting other files from the archive
-                        with zip_file.open(file_info) as source:
-                            os.makedirs(os.path.dirname(dll_path), exist_ok=True)
-                            with open(dll_path, 'wb') as target:
-                                target.write(source.read())
-                        dll_found = True
-                        self.log(f"✓ Extracted lame_enc.dll (discarded other archive contents)")
-                        break
+            # Spool the archive to a temp file instead of holding it in memory
+            with tempfile.TemporaryFile() as zip_data:
+                with urllib.request.urlopen(url, timeout=30) as response:
+                    shutil.copyfileobj(response, zip_data, length=1 << 20)
+                zip_data.seek(0)
+                
+                # Extract only lame_enc.dll from the ZIP (don't keep anything else)
+                with zipfile.ZipFile(zip_data) as zip_file:
+                    # Find lame_enc.dll in the ZIP
+                    dll_found = False
+                    for file_info in zip_file.namelist():
+                        if file_info.endswith('lame_enc.dll'):
+                            # Extract directly to the target location (archive -> file)
+                            # This avoids extracting other files from the archive
+                            with zip_file.open(file_info) as source:
+                                os.makedirs(os.path.dirname(dll_path), exist_ok=True)
+                                with open(dll_path, 'wb') as target:
+                                    shutil.copyfileobj(source, target, length=1 << 20)
+                            dll_found = True
+                            self.log(f"✓ Extracted lame_enc.dll (discarded other archive contents)")
+                            break
                 
-                if not dll_found:
-                    self.log("✗ Error: lame_enc.dll not found in downloaded archive")
-                    return False
+                    if not dll_found:
+                        self.log("✗ Error: lame_enc.dll not found in downloaded archive")
+                        return False
             
             self.log(f"✓ Successfully installed lame_enc.dll to: {dll_path}")
             self.log("  MP3 compression is now available")
@@ -1128,61 +1576,57 @@ class SoundsManagerApp:
         try:
             encoding_path = os.path.join(sounds_folder, 'encoding.txt')
             
-            # Build the encoding.txt content
-            header = '''<!-- kv3 encoding:text:version{e21c7f3c-8a33-41c5-9977-a76d3a32aa0d} format:generic:version{7412167c-06e9-4698-aff2-e63eb59037e7} -->
+            # Build the encoding.txt content as a list of blocks, joined once at the end
+            parts = ['''<!-- kv3 encoding:text:version{e21c7f3c-8a33-41c5-9977-a76d3a32aa0d} format:generic:version{7412167c-06e9-4698-aff2-e63eb59037e7} -->
 {
-'''
+''']
             
             # Global compression settings
-            compress_block = ""
             if self.encoding_format != "PCM":
                 if self.encoding_format == "mp3":
                     vbr_value = 1 if self.encoding_vbr else 0
-                    compress_block = f'''\tcompress =
+                    parts.append(f'''\tcompress =
 \t{{
 \t\tformat = "mp3"
 \t\tminbitrate = {self.encoding_minbitrate}
 \t\tmaxbitrate = {self.encoding_maxbitrate}
 \t\tvbr = {vbr_value}
 \t}}
-'''
+''')
                 elif self.encoding_format == "adpcm":
-                    compress_block = '''\tcompress =
+                    parts.append('''\tcompress =
 \t{
 \t\tformat = "adpcm"
 \t}
-'''
+''')
             
             # Sample rate settings
-            sample_rate_block = ""
             if self.encoding_sample_rate > 0:
-                sample_rate_block = f'''\trate = {self.encoding_sample_rate}
-'''
+                parts.append(f'''\trate = {self.encoding_sample_rate}
+''')
             
             # Normalization settings
-            normalize_block = ""
             if self.encoding_normalize:
-                normalize_block = f'''\tnormalize =
+                parts.append(f'''\tnormalize =
 \t{{
 \t\tlevel = {self.encoding_normalize_level}
-'''
+''')
                 if self.encoding_normalize_compression:
-                    normalize_block += '''\t\tcompression = true
-'''
+                    parts.append('''\t\tcompression = true
+''')
                 if self.encoding_normalize_limiter:
-                    normalize_block += '''\t\tlimiter = true
-'''
-                normalize_block += '''\t}
-'''
+                    parts.append('''\t\tlimiter = true
+''')
+                parts.append('''\t}
+''')
             
             # File-specific settings (loop points)
-            files_block = ""
             if self.encoding_loop_enabled and self.audio_duration_ms > 0:
                 # Convert milliseconds to seconds
                 loop_start_sec = self.encoding_loop_start_ms / 1000.0
                 loop_end_sec = self.encoding_loop_end_ms / 1000.0
                 
-                files_block = f'''\tfiles =
+                parts.append(f'''\tfiles =
 \t[
 \t\t{{
 \t\t\tfileName = "{sound_filename}"
@@ -1194,13 +1638,13 @@ class SoundsManagerApp:
 \t\t\t}}
 \t\t}},
 \t]
-'''
+''')
             
-            footer = '}\n'
+            parts.append('}\n')
             
             # Write the file
             with open(encoding_path, 'w', encoding='utf-8') as f:
-                f.write(header + compress_block + sample_rate_block + normalize_block + files_block + footer)
+                f.write(''.join(parts))
             
             self.log(f"✓ Created encoding.txt: {encoding_path}")
             if self.encoding_format != "PCM":
@@ -1224,9 +1668,9 @@ class SoundsManagerApp:
             return False
     
     def download_ffmpeg(self):
-        """Download ffmpeg in background thread (non-blocking)"""
+        """Download ffmpeg in background thread (non-blocking), UI thread only - workers post ffmpeg_download_requested"""
         # Store ffmpeg in the app's temp folder
-        ffmpeg_dir = os.path.join(os.getenv('LOCALAPPDATA'), 'Temp', '.CS2KZ-mapping-tools', 'Sounds', 'ffmpeg')
+        ffmpeg_dir = self.ffmpeg_dir
         ffmpeg_path = os.path.join(ffmpeg_dir, 'ffmpeg.exe')
         
         # Check if ffmpeg already exists
@@ -1241,6 +1685,7 @@ class SoundsManagerApp:
             return
         
         self.downloading_ffmpeg = True
+        self.ffmpeg_download_progress = 0
         self.log("⏳ Downloading ffmpeg + ffprobe (~100MB download, ~200MB installed)...")
         
         def download_thread():
@@ -1248,60 +1693,77 @@ class SoundsManagerApp:
                 # Download ffmpeg essentials build (includes both ffmpeg and ffprobe)
                 url = "https://www.gyan.dev/ffmpeg/builds/ffmpeg-release-essentials.zip"
                 
-                with urllib.request.urlopen(url, timeout=120) as response:
-                    zip_data = response.read()
+                os.makedirs(ffmpeg_dir, exist_ok=True)
+                
+                # Download into a .part file next to the install, an interrupted download resumes
+                # from where it stopped (HTTP Range) instead of starting the ~100MB over
+                part_path = os.path.join(ffmpeg_dir, 'ffmpeg-release-essentials.zip.part')
+                downloaded = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+                request = urllib.request.Request(url, headers={'Range': f'bytes={downloaded}-'} if downloaded else {})
+                try:
+                    response = urllib.request.urlopen(request, timeout=120)
+                except urllib.error.HTTPError as e:
+                    if e.code != 416:
+                        raise
+                    response = None  # Range not satisfiable - the .part file is already complete
+                
+                if response:
+                    with response:
+                        if response.status != 206:
+                            downloaded = 0  # Server ignored the range, start over
+                        total = downloaded + int(response.headers.get('Content-Length') or 0)
+                        last_percent = -1
+                        with open(part_path, 'ab' if downloaded else 'wb') as part_file:
+                            while True:
+                                chunk = response.read(1 << 20)
+                                if not chunk:
+                                    break
+                                part_file.write(chunk)
+                                downloaded += len(chunk)
+                                percent = downloaded * 100 // total if total else 0
+                                if percent != last_percent:
+                                    last_percent = percent
+                                    self.post_state(ffmpeg_download_progress=percent)
                 
                 self.log("⏳ Extracting ffmpeg.exe and ffprobe.exe...")
                 
                 # Extract ffmpeg.exe and ffprobe.exe from the ZIP (pydub needs both)
-                os.makedirs(ffmpeg_dir, exist_ok=True)
-                
-                with zipfile.ZipFile(io.BytesIO(zip_data)) as zip_file:
-                    ffmpeg_found = False
-                    ffprobe_found = False
-                    
-                    for file_info in zip_file.namelist():
-                        if file_info.endswith('bin/ffmpeg.exe'):
-                            # Extract ffmpeg.exe
-                            with zip_file.open(file_info) as source:
-                                with open(ffmpeg_path, 'wb') as target:
-                                    target.write(source.read())
-                            ffmpeg_found = True
-                            self.log(f"✓ Installed ffmpeg.exe")
-                        elif file_info.endswith('bin/ffprobe.exe'):
-                            # Extract ffprobe.exe
-                            ffprobe_path = os.path.join(ffmpeg_dir, 'ffprobe.exe')
-                            with zip_file.open(file_info) as source:
-                                with open(ffprobe_path, 'wb') as target:
-                                    target.write(source.read())
-                            ffprobe_found = True
-                            self.log(f"✓ Installed ffprobe.exe")
+                try:
+                    with zipfile.ZipFile(part_path) as zip_file:
+                        # Everything lives under one versioned folder, e.g. ffmpeg-7.1-essentials_build/bin/
+                        prefix = zip_file.namelist()[0].split('/', 1)[0] + '/'
+                        ffprobe_path = os.path.join(ffmpeg_dir, 'ffprobe.exe')
                         
-                        if ffmpeg_found and ffprobe_found:
-                            break
-                    
-                    if not ffmpeg_found or not ffprobe_found:
-                        self.log("✗ Error: ffmpeg.exe or ffprobe.exe not found in archive")
-                        self.downloading_ffmpeg = False
-                        return
-                
-                # Configure pydub to use our ffmpeg
-                from pydub import AudioSegment
-                AudioSegment.converter = ffmpeg_path
-                self.ffmpeg_path = ffmpeg_path
+                        for member, target_path in ((prefix + 'bin/ffmpeg.exe', ffmpeg_path),
+                                                    (prefix + 'bin/ffprobe.exe', ffprobe_path)):
+                            with zip_file.open(member) as source, open(target_path, 'wb') as target:
+                                shutil.copyfileobj(source, target, length=1 << 20)
+                            self.log(f"✓ Installed {os.path.basename(target_path)}")
+                except (KeyError, zipfile.BadZipFile):
+                    # Unusable archive (e.g. a resume stitched onto a newer release), next try starts fresh
+                    os.remove(part_path)
+                    self.log("✗ Error: ffmpeg.exe or ffprobe.exe not found in archive")
+                    self.post_state(downloading_ffmpeg=False)
+                    return
+                os.remove(part_path)
                 
                 self.log("✓ ffmpeg + ffprobe installed - MP3 loop extraction now available")
                 self.log("  Loop preview will now extract exact segments from MP3 files")
-                self.downloading_ffmpeg = False
+                self.post_state(ffmpeg_path=ffmpeg_path, downloading_ffmpeg=False)
                 
             except Exception as e:
                 self.log(f"✗ Error downloading ffmpeg + ffprobe: {e}")
                 self.log("  Internal sounds will play as MP3 with limited loop support")
-                self.downloading_ffmpeg = False
+                self.post_state(downloading_ffmpeg=False)
         
         thread = threading.Thread(target=download_thread, daemon=True)
         thread.start()
     
+    def addon_folders(self, addon_name):
+        """(content, game) root folders of an addon, the sounds/soundevents paths are built from these"""
+        return (os.path.join(self.cs2_basefolder, 'content', 'csgo_addons', addon_name),
+                os.path.join(self.cs2_basefolder, 'game', 'csgo_addons', addon_name))
+    
     def add_sound(self):
         """Add the sound file to the addon folder and update soundevents file"""
         # Validate inputs
@@ -1313,6 +1775,10 @@ class SoundsManagerApp:
             self.log("✗ Error: CS2 path not detected")
             return
         
+        if self.compiling_sound:
+            self.log("✗ Error: Still compiling the previous sound, please wait")
+            return
+        
         # Validate sound selection based on source
         if self.use_internal_sound:
             if not self.selected_internal_sound:
@@ -1331,29 +1797,23 @@ class SoundsManagerApp:
         
         try:
             addon_name = self.addon_name.strip()
+            content_addon, game_addon = self.addon_folders(addon_name)
+            sounds_folder = os.path.join(content_addon, 'sounds')
+            game_sounds_folder = os.path.join(game_addon, 'sounds')  # Where the compiled .vsnd_c ends up
             
             # Handle custom file or internal sound differently
             if not self.use_internal_sound:
                 # Custom file workflow (original behavior)
-                # Construct the sounds folder path
-                sounds_folder = os.path.join(
-                    self.cs2_basefolder,
-                    'content',
-                    'csgo_addons',
-                    addon_name,
-                    'sounds'
-                )
-                
                 # Create sounds folder if it doesn't exist
                 os.makedirs(sounds_folder, exist_ok=True)
                 self.log(f"✓ Content sounds folder: {sounds_folder}")
                 
                 # Use output_name for the destination filename if specified, otherwise use original filename
-                output_filename = self.output_name if self.output_name else os.path.splitext(os.path.basename(self.sound_file_path))[0]
-                file_extension = os.path.splitext(self.sound_file_path)[1]
+                source_root, file_extension = os.path.splitext(self.sound_file_path)
+                output_filename = self.output_name if self.output_name else os.path.basename(source_root)
                 dest_filename = output_filename + file_extension
                 dest_path = os.path.join(sounds_folder, dest_filename)
-                shutil.copy2(self.sound_file_path, dest_path)
+                shutil.copyfile(self.sound_file_path, dest_path)
                 self.log(f"✓ Content root file (.wav/.mp3): {dest_path}")
                 
                 # Create encoding.txt for loop points and compression (Source 2 native method)
@@ -1367,22 +1827,6 @@ class SoundsManagerApp:
                 
                 # Update sound_name to use the output name for soundevent creation
                 sound_name_for_event = output_filename
-                
-                # Compile the sound file directly (creates .vsnd_c in game root)
-                if not self.compile_sound_file(dest_path):
-                    self.log("✗ Warning: Sound file compilation failed, but content file was created")
-                else:
-                    # Calculate game root path where .vsnd_c will be
-                    game_sounds_folder = os.path.join(
-                        self.cs2_basefolder,
-                        'game',
-                        'csgo_addons',
-                        addon_name,
-                        'sounds'
-                    )
-                    vsnd_c_filename = os.path.splitext(dest_filename)[0] + ".vsnd_c"
-                    vsnd_c_path = os.path.join(game_sounds_folder, vsnd_c_filename)
-                    self.log(f"✓ Game root file (.vsnd_c): {vsnd_c_path}")
             else:
                 # Internal sound workflow - copy the decompiled sound to addon folder
                 # so it gets compiled and appears in asset browser like custom sounds
@@ -1393,39 +1837,39 @@ class SoundsManagerApp:
                     self.log("✗ Error: Internal sound not available. Please preview it first.")
                     return
                 
-                # Construct the sounds folder path in content
-                sounds_folder = os.path.join(
-                    self.cs2_basefolder,
-                    'content',
-                    'csgo_addons',
-                    addon_name,
-                    'sounds'
-                )
-                
                 # Create sounds folder if it doesn't exist
                 os.makedirs(sounds_folder, exist_ok=True)
                 self.log(f"✓ Content sounds folder: {sounds_folder}")
                 
-                # Use output_name for the destination filename
-                output_filename = self.output_name if self.output_name else os.path.splitext(os.path.basename(self.cached_internal_sound_path))[0]
+                # Use output_name for the destination filename (the path is split once for name and extension)
+                source_root, file_extension = os.path.splitext(self.cached_internal_sound_path)
+                output_filename = self.output_name if self.output_name else os.path.basename(source_root)
                 
                 # Check if source is MP3 and we need WAV for loop points
-                file_extension = os.path.splitext(self.cached_internal_sound_path)[1]
                 is_mp3 = file_extension.lower() == '.mp3'
                 
                 # Convert MP3 to WAV if loop points are enabled (CS2 requires WAV for loops)
                 if is_mp3 and self.use_wav_markers and self.encoding_loop_enabled:
                     self.log("  Converting MP3 to WAV (required for loop points)...")
                     try:
-                        import subprocess
-                        
                         dest_filename = output_filename + '.wav'
                         dest_path = os.path.join(sounds_folder, dest_filename)
                         
-                        # Use ffmpeg directly for conversion (more reliable than pydub)
-                        if self.ffmpeg_path and os.path.exists(self.ffmpeg_path):
+                        # A loop preview of this MP3 may already hold its PCM in the same 16-bit 44.1kHz format
+                        source_key = (self.cached_internal_sound_path, os.path.getmtime(self.cached_internal_sound_path))
+                        decoded = self.loop_source[1] if self.loop_source and self.loop_source[0] == source_key else None
+                        
+                        # Use ffmpeg directly for conversion (ours, or one on PATH)
+                        ffmpeg_exe = self.ffmpeg_path or shutil.which('ffmpeg')
+                        if decoded and decoded[1] == 44100 and decoded[2] == 2:
+                            # Write the already decoded PCM instead of decoding the MP3 a second time
+                            n_channels, framerate, sampwidth, pcm = decoded
+                            with open(dest_path, 'wb') as f:
+                                f.write(pcm_to_wav(pcm, n_channels, framerate, sampwidth))
+                            self.log(f"✓ Content root file (.wav): {dest_path}")
+                        elif ffmpeg_exe:
                             ffmpeg_cmd = [
-                                self.ffmpeg_path,
+                                ffmpeg_exe,
                                 '-i', self.cached_internal_sound_path,
                                 '-acodec', 'pcm_s16le',
                                 '-ar', '44100',
@@ -1433,31 +1877,29 @@ class SoundsManagerApp:
                                 dest_path
                             ]
                             result = subprocess.run(ffmpeg_cmd, capture_output=True, text=True, 
-                                                  creationflags=subprocess.CREATE_NO_WINDOW if hasattr(subprocess, 'CREATE_NO_WINDOW') else 0)
+                                                  stdin=subprocess.DEVNULL, creationflags=SUBPROCESS_FLAGS)
                             
                             if result.returncode == 0 and os.path.exists(dest_path):
                                 self.log(f"✓ Content root file (.wav): {dest_path}")
                             else:
                                 raise Exception(f"ffmpeg conversion failed: {result.stderr}")
                         else:
-                            # Fallback to pydub if ffmpeg not available
-                            from pydub import AudioSegment
-                            audio = AudioSegment.from_mp3(self.cached_internal_sound_path)
-                            audio.export(dest_path, format="wav")
-                            self.log(f"✓ Content root file (.wav): {dest_path}")
+                            # No in-Python decode fallback, fetch ffmpeg for next time and keep the MP3
+                            self.post_state(ffmpeg_download_requested=True)
+                            raise Exception("ffmpeg is not installed yet")
                     except Exception as e:
                         self.log(f"✗ Error converting MP3 to WAV: {e}")
                         self.log("  Falling back to MP3 (loop points may not work)")
                         # Fall back to copying MP3
                         dest_filename = output_filename + file_extension
                         dest_path = os.path.join(sounds_folder, dest_filename)
-                        shutil.copy2(self.cached_internal_sound_path, dest_path)
+                        link_or_copy(self.cached_internal_sound_path, dest_path)
                         self.log(f"✓ Content root file ({file_extension}): {dest_path}")
                 else:
                     # Copy the sound file as-is (MP3 or WAV)
                     dest_filename = output_filename + file_extension
                     dest_path = os.path.join(sounds_folder, dest_filename)
-                    shutil.copy2(self.cached_internal_sound_path, dest_path)
+                    link_or_copy(self.cached_internal_sound_path, dest_path)
                     self.log(f"✓ Content root file ({file_extension}): {dest_path}")
                 
                 # Create encoding.txt for loop points and compression if enabled
@@ -1470,31 +1912,9 @@ class SoundsManagerApp:
                 
                 # Update sound_name to use the output name for soundevent creation
                 sound_name_for_event = output_filename
-                
-                # Compile the sound file directly (creates .vsnd_c in game root)
-                if not self.compile_sound_file(dest_path):
-                    self.log("✗ Warning: Sound file compilation failed, but content file was created")
-                else:
-                    # Calculate game root path where .vsnd_c will be
-                    game_sounds_folder = os.path.join(
-                        self.cs2_basefolder,
-                        'game',
-                        'csgo_addons',
-                        addon_name,
-                        'sounds'
-                    )
-                    vsnd_c_filename = os.path.splitext(dest_filename)[0] + ".vsnd_c"
-                    vsnd_c_path = os.path.join(game_sounds_folder, vsnd_c_filename)
-                    self.log(f"✓ Game root file (.vsnd_c): {vsnd_c_path}")
             
             # Update soundevents_addon.vsndevts file
-            soundevents_folder = os.path.join(
-                self.cs2_basefolder,
-                'content',
-                'csgo_addons',
-                addon_name,
-                'soundevents'
-            )
+            soundevents_folder = os.path.join(content_addon, 'soundevents')
             os.makedirs(soundevents_folder, exist_ok=True)
             
             soundevents_file = os.path.join(soundevents_folder, 'soundevents_addon.vsndevts')
@@ -1503,28 +1923,39 @@ class SoundsManagerApp:
             # (internal sounds are copied to addon folder now)
             self.update_soundevents_file(soundevents_file, dest_filename, None)
             
-            # Compile the soundevents file so Hammer can see it
-            if not self.compile_sound_file(soundevents_file):
-                self.log("✗ Warning: Soundevents file compilation failed")
-            else:
-                game_soundevents_folder = os.path.join(
-                    self.cs2_basefolder,
-                    'game',
-                    'csgo_addons',
-                    addon_name,
-                    'soundevents'
-                )
-                soundevents_c_path = os.path.join(game_soundevents_folder, 'soundevents_addon.vsndevts_c')
-                self.log(f"✓ Game soundevents file (.vsndevts_c): {soundevents_c_path}")
-            
+            # Compile the sound file (creates .vsnd_c in game root) and the soundevents file so
+            # Hammer can see it, in parallel on the worker pool so the window stays responsive
+            vsnd_c_path = os.path.join(game_sounds_folder, os.path.splitext(dest_filename)[0] + ".vsnd_c")
+            soundevents_c_path = os.path.join(game_addon, 'soundevents', 'soundevents_addon.vsndevts_c')
             event_name = self.output_name if self.output_name else self.sound_name
-            self.log(f"✓ Sound added successfully! Event name: {event_name}")
+            compile_jobs = [self.worker_pool.submit(self.compile_sound_file, dest_path),
+                            self.worker_pool.submit(self.compile_sound_file, soundevents_file)]
+            self.compiling_sound = True
+            # Queued after both compiles, so it never waits on a job that has no worker yet
+            self.worker_pool.submit(self.finish_add_sound, compile_jobs, vsnd_c_path, soundevents_c_path, event_name)
             
         except Exception as e:
             self.log(f"✗ Error adding sound: {e}")
             import traceback
             traceback.print_exc()
     
+    def finish_add_sound(self, compile_jobs, vsnd_c_path, soundevents_c_path, event_name):
+        """Report the results of add_sound's compile jobs (runs on a worker thread)"""
+        sound_compiled, soundevents_compiled = (job.result() for job in compile_jobs)
+        
+        if not sound_compiled:
+            self.log("✗ Warning: Sound file compilation failed, but content file was created")
+        else:
+            self.log(f"✓ Game root file (.vsnd_c): {vsnd_c_path}")
+        
+        if not soundevents_compiled:
+            self.log("✗ Warning: Soundevents file compilation failed")
+        else:
+            self.log(f"✓ Game soundevents file (.vsndevts_c): {soundevents_c_path}")
+        
+        self.log(f"✓ Sound added successfully! Event name: {event_name}")
+        self.post_state(compiling_sound=False)
+    
     def update_soundevents_file(self, soundevents_file, sound_filename=None, internal_sound_path=None):
         """Update or create the soundevents_addon.vsndevts file with new sound entry"""
         # Use output_name for the soundevent name (user-customizable)
@@ -1545,45 +1976,79 @@ class SoundsManagerApp:
         if self.use_wav_markers:
             wav_markers_line = '\t\tuse_wav_markers = true\n'
         
-        soundevent_entry = f'''\t"{event_name}" =
-\t{{
-\t\ttype = "{self.sound_type}"
-\t\tvsnd_files_track_01 = "{vsnd_reference}"
-\t\tvolume = {self.volume:.1f}
-\t\tpitch = {self.pitch:.2f}
-{wav_markers_line}\t\tuse_distance_volume_mapping_curve = true
-\t\tdistance_volume_mapping_curve = 
-\t\t[
-\t\t\t[{self.distance_near:.1f}, {self.distance_near_volume:.1f}, {self.curve_near_mid_cp1:.3f}, {self.curve_near_mid_cp2:.3f}, {self.curve_near_mid_cp3:.3f}, {self.curve_near_mid_cp4:.3f},],
-\t\t\t[{self.distance_mid:.1f}, {self.distance_mid_volume:.1f}, {self.curve_mid_far_cp1:.3f}, {self.curve_mid_far_cp2:.3f}, {self.curve_mid_far_cp3:.3f}, {self.curve_mid_far_cp4:.3f}],
-\t\t\t[{self.distance_far:.1f}, {self.distance_far_volume:.1f}, 0.0, 0.0, 1.0, 1.0],
-\t\t]
-\t\tocclusion = {str(self.show_occlusion).lower()}
-\t\tocclusion_intensity = {int(self.occlusion_intensity)}
-\t}}
-'''
+        soundevent_entry = SOUNDEVENT_TEMPLATE % (
+            event_name, self.sound_type, vsnd_reference, self.volume, self.pitch, wav_markers_line,
+            self.distance_near, self.distance_near_volume,
+            self.curve_near_mid_cp1, self.curve_near_mid_cp2, self.curve_near_mid_cp3, self.curve_near_mid_cp4,
+            self.distance_mid, self.distance_mid_volume,
+            self.curve_mid_far_cp1, self.curve_mid_far_cp2, self.curve_mid_far_cp3, self.curve_mid_far_cp4,
+            self.distance_far, self.distance_far_volume,
+            str(self.show_occlusion).lower(), int(self.occlusion_intensity))
         
         if os.path.exists(soundevents_file):
-            # File exists, check if sound name already exists and remove it
-            with open(soundevents_file, 'r', encoding='utf-8') as f:
+            # File exists: drop any entry with the same name, insert the new one before the final
+            # closing brace, and only rewrite the file from the first changed byte onwards
+            with open(soundevents_file, 'r+b') as f:
                 content = f.read()
-            
-            # Remove existing entry with the same name if it exists
-            # Pattern to match the entire sound entry block
-            pattern = rf'\t"{re.escape(event_name)}"\s*=\s*\{{[^}}]*\}}\n?'
-            content = re.sub(pattern, '', content, flags=re.DOTALL)
-            
-            # Find the last closing brace
-            last_brace_index = content.rfind('}')
-            if last_brace_index != -1:
-                # Insert before the last closing brace
-                new_content = content[:last_brace_index] + soundevent_entry + content[last_brace_index:]
-            else:
-                # Shouldn't happen, but append anyway
-                new_content = content + soundevent_entry + '\n}'
-            
-            with open(soundevents_file, 'w', encoding='utf-8') as f:
-                f.write(new_content)
+                # Line ending style from the first (kv3 header) line, instead of searching the whole file
+                first_newline = content.find(b'\n')
+                newline = b'\r\n' if first_newline > 0 and content[first_newline - 1] == 0x0D else b'\n'
+                entry = soundevent_entry.encode('utf-8').replace(b'\n', newline)
+                
+                # Entries are tab-indented name = { ... } blocks closed by a tab-indented brace
+                entry_pattern = self.event_patterns.get(event_name)
+                if entry_pattern is None:
+                    entry_pattern = re.compile(rb'^\t"' + re.escape(event_name.encode('utf-8')) + rb'"\s*=\s*\{', re.MULTILINE)
+                    self.event_patterns[event_name] = entry_pattern
+                # Spans of the entries being replaced, found in one pass without rebuilding the content
+                removed = []
+                existing = entry_pattern.search(content)
+                while existing:
+                    entry_end = SOUNDEVENT_END_PATTERN.search(content, existing.end())
+                    end = entry_end.end() if entry_end else len(content)
+                    removed.append((existing.start(), end))
+                    existing = entry_pattern.search(content, end)
+                
+                # Find the last closing brace that is not part of a removed entry
+                last_brace_index = content.rfind(b'}')
+                for start, end in reversed(removed):
+                    if last_brace_index >= end:
+                        break
+                    if last_brace_index >= start:
+                        last_brace_index = content.rfind(b'}', 0, start)
+                if last_brace_index != -1:
+                    # Insert before the last closing brace
+                    insert_at = last_brace_index
+                    tail = b''
+                else:
+                    # Shouldn't happen, but append anyway
+                    insert_at = len(content)
+                    tail = newline + b'}'
+                
+                # Only the bytes from the first change onwards are rewritten: the kept spans after it
+                # (the removed entries elided) with the new entry spliced in before the brace
+                rewrite_from = min(removed[0][0], insert_at) if removed else insert_at
+                kept = []
+                pos = rewrite_from
+                for start, end in removed:
+                    if start > pos:
+                        kept.append((pos, start))
+                    pos = max(pos, end)
+                kept.append((pos, len(content)))
+                
+                view = memoryview(content)
+                pieces = []
+                inserted = False
+                for start, end in kept:
+                    if not inserted and start <= insert_at <= end:
+                        pieces += [view[start:insert_at], entry, view[insert_at:end]]
+                        inserted = True
+                    else:
+                        pieces.append(view[start:end])
+                pieces.append(tail)
+                f.seek(rewrite_from)
+                f.writelines(pieces)
+                f.truncate()
             
             self.log(f"✓ Updated soundevents file (overwritten if existed): {soundevents_file}")
         else:
@@ -1594,7 +2059,7 @@ class SoundsManagerApp:
             footer = '}\n'
             
             with open(soundevents_file, 'w', encoding='utf-8') as f:
-                f.write(header + soundevent_entry + footer)
+                f.writelines((header, soundevent_entry, footer))
             
             self.log(f"✓ Created soundevents file: {soundevents_file}")
     
@@ -1619,7 +2084,8 @@ class SoundsManagerApp:
             self.log(f"Compiling {os.path.basename(audio_file_path)}...")
             
             command = [compiler_path, '-i', relative_audio_path]
-            result = subprocess.run(command, cwd=compiler_cwd, check=True, capture_output=True, text=True)
+            result = subprocess.run(command, cwd=compiler_cwd, check=True, capture_output=True, text=True,
+                                    stdin=subprocess.DEVNULL, creationflags=SUBPROCESS_FLAGS)
             
             self.log(f"✓ Compilation successful for {os.path.basename(audio_file_path)}")
             return True
@@ -1646,17 +2112,13 @@ class SoundsManagerApp:
                 self.log("✗ Error: Please enter an addon name")
                 return
             
-            sounds_folder = os.path.join(
-                self.cs2_basefolder,
-                'content',
-                'csgo_addons',
-                self.addon_name.strip(),
-                'sounds'
-            )
+            sounds_folder = os.path.join(self.addon_folders(self.addon_name.strip())[0], 'sounds')
             
-            if not os.path.exists(sounds_folder):
-                os.makedirs(sounds_folder, exist_ok=True)
+            try:
+                os.makedirs(sounds_folder)
                 self.log(f"✓ Created sounds folder: {sounds_folder}")
+            except FileExistsError:
+                pass
             
             os.startfile(sounds_folder)
             self.log(f"✓ Opened sounds folder")
@@ -1700,11 +2162,12 @@ class SoundsManagerApp:
         glfw.set_window_pos(self.window, x_pos, y_pos)
         
         glfw.make_context_current(self.window)
-        glfw.swap_interval(1)
+        # No vsync: avoids an extra frame of input lag while dragging, run() caps the frame rate
+        glfw.swap_interval(0)
         
         # Set window icon
-        icon_path = resource_path(os.path.join("icons", "sounds.ico"))
-        if os.path.exists(icon_path):
+        icon_path = find_icon("sounds.ico")
+        if icon_path:
             try:
                 icon_img = Image.open(icon_path)
                 if icon_img.mode != 'RGBA':
@@ -1744,28 +2207,17 @@ class SoundsManagerApp:
         # Create renderer AFTER loading fonts
         self.impl = GlfwRenderer(self.window)
         
+        # Keep cached window size in sync via callback instead of querying GLFW per frame.
+        # Registered after GlfwRenderer, which installs its own size callback we chain to.
+        glfw.set_window_size_callback(self.window, self.on_window_resize)
+        glfw.set_window_refresh_callback(self.window, self.on_window_refresh)
+        self.chain_input_callbacks()
+        
         # Apply theme colors to ImGui
-        theme = self.theme_manager.get_theme()
+        self.reapply_theme()
+        self.title_glyph_color = imgui.get_color_u32_rgba(0.8, 0.8, 0.8, 1.0)  # Packed once for the title bar glyphs
         style = imgui.get_style()
         
-        # Apply theme colors
-        style.colors[imgui.COLOR_WINDOW_BACKGROUND] = theme['window_bg']
-        style.colors[imgui.COLOR_BUTTON] = theme['button']
-        style.colors[imgui.COLOR_BUTTON_HOVERED] = theme['button_hover']
-        style.colors[imgui.COLOR_BUTTON_ACTIVE] = theme['button_active']
-        style.colors[imgui.COLOR_BORDER] = theme['border']
-        style.colors[imgui.COLOR_TEXT] = theme['text']
-        style.colors[imgui.COLOR_FRAME_BACKGROUND] = theme['button']
-        style.colors[imgui.COLOR_FRAME_BACKGROUND_HOVERED] = theme['button_hover']
-        style.colors[imgui.COLOR_FRAME_BACKGROUND_ACTIVE] = theme['button_active']
-        
-        # Slider colors (match theme)
-        style.colors[imgui.COLOR_SLIDER_GRAB] = theme['button_active']
-        style.colors[imgui.COLOR_SLIDER_GRAB_ACTIVE] = theme['button_hover']
-        
-        # Checkbox colors (match theme)
-        style.colors[imgui.COLOR_CHECK_MARK] = theme['button_active']
-        
         # Style settings
         style.window_rounding = 0.0
         style.frame_rounding = 7.0
@@ -1780,75 +2232,78 @@ class SoundsManagerApp:
         self.load_title_icon()
         self.load_control_icons()
     
+    def on_window_resize(self, window, width, height):
+        """GLFW window size callback - update cached window dimensions"""
+        self.impl.resize_callback(window, width, height)
+        if width > 0 and height > 0:
+            self.window_width = width
+            self.base_window_height = height
+        self.input_received = True
+    
+    def on_window_refresh(self, window):
+        """GLFW window refresh callback - the OS wants the window contents repainted"""
+        self.window_refresh_requested = True
+    
+    def chain_input_callbacks(self):
+        """Wrap GlfwRenderer's input callbacks so run() knows when new input arrived"""
+        def chain(set_callback, handler):
+            def callback(*args):
+                self.input_received = True
+                if handler:
+                    handler(*args)
+            set_callback(self.window, callback)
+        
+        chain(glfw.set_key_callback, self.impl.keyboard_callback)
+        chain(glfw.set_char_callback, self.impl.char_callback)
+        chain(glfw.set_scroll_callback, self.impl.scroll_callback)
+        chain(glfw.set_cursor_pos_callback, self.on_cursor_pos)
+        chain(glfw.set_mouse_button_callback, self.on_mouse_button)
+    
+    def on_cursor_pos(self, window, mouse_x, mouse_y):
+        """GLFW cursor position callback - moves the window while the title bar is dragged"""
+        if self.dragging_window and glfw.get_mouse_button(window, glfw.MOUSE_BUTTON_LEFT) != glfw.PRESS:
+            # Button was released before the drag started being tracked
+            self.dragging_window = False
+        if self.dragging_window:
+            win_x, win_y = glfw.get_window_pos(window)
+            new_x = int(win_x + mouse_x - self.drag_offset_x)
+            new_y = int(win_y + mouse_y - self.drag_offset_y)
+            glfw.set_window_pos(window, new_x, new_y)
+        self.impl.mouse_callback(window, mouse_x, mouse_y)
+    
+    def on_mouse_button(self, window, button, action, mods):
+        """GLFW mouse button callback - releasing the left button ends window dragging"""
+        if button == glfw.MOUSE_BUTTON_LEFT and action == glfw.RELEASE:
+            self.dragging_window = False
+    
+    def upload_rgba_texture(self, img_data, width, height):
+        """Create a linearly filtered OpenGL texture from tightly packed RGBA bytes"""
+        texture = gl.glGenTextures(1)
+        gl.glBindTexture(gl.GL_TEXTURE_2D, texture)
+        gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MIN_FILTER, gl.GL_LINEAR)
+        gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MAG_FILTER, gl.GL_LINEAR)
+        gl.glTexImage2D(gl.GL_TEXTURE_2D, 0, gl.GL_RGBA8, width, height,
+                       0, gl.GL_RGBA, gl.GL_UNSIGNED_BYTE, img_data)
+        return texture
+    
     def load_title_icon(self):
         """Load title icon as OpenGL texture"""
-        icon_path = resource_path(os.path.join("icons", "sounds.ico"))
-        if os.path.exists(icon_path):
-            try:
-                img = Image.open(icon_path)
-                if img.mode != "RGBA":
-                    img = img.convert("RGBA")
-                img = img.resize((16, 16), Image.Resampling.LANCZOS)
-                width, height = img.size
-                img_data = img.tobytes()
-                
-                # Create OpenGL texture
-                texture = gl.glGenTextures(1)
-                gl.glBindTexture(gl.GL_TEXTURE_2D, texture)
-                gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MIN_FILTER, gl.GL_LINEAR)
-                gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MAG_FILTER, gl.GL_LINEAR)
-                gl.glTexImage2D(gl.GL_TEXTURE_2D, 0, gl.GL_RGBA, width, height,
-                               0, gl.GL_RGBA, gl.GL_UNSIGNED_BYTE, img_data)
-                
-                self.title_icon = texture
-            except Exception as e:
-                print(f"Failed to load title icon: {e}")
+        try:
+            img_data = load_icon_rgba("sounds.ico", 16, self.icon_cache_dir)
+            if img_data:
+                self.title_icon = self.upload_rgba_texture(img_data, 16, 16)
+        except Exception as e:
+            print(f"Failed to load title icon: {e}")
     
     def load_control_icons(self):
         """Load play and pause icons as OpenGL textures"""
-        # Load play icon
-        play_icon_path = resource_path(os.path.join("icons", "play.ico"))
-        if os.path.exists(play_icon_path):
+        for icon_name in ("play", "pause"):
             try:
-                img = Image.open(play_icon_path)
-                if img.mode != "RGBA":
-                    img = img.convert("RGBA")
-                img = img.resize((20, 20), Image.Resampling.LANCZOS)
-                width, height = img.size
-                img_data = img.tobytes()
-                
-                texture = gl.glGenTextures(1)
-                gl.glBindTexture(gl.GL_TEXTURE_2D, texture)
-                gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MIN_FILTER, gl.GL_LINEAR)
-                gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MAG_FILTER, gl.GL_LINEAR)
-                gl.glTexImage2D(gl.GL_TEXTURE_2D, 0, gl.GL_RGBA, width, height,
-                               0, gl.GL_RGBA, gl.GL_UNSIGNED_BYTE, img_data)
-                
-                self.play_icon = texture
+                img_data = load_icon_rgba(f"{icon_name}.ico", 20, self.icon_cache_dir)
+                if img_data:
+                    setattr(self, f"{icon_name}_icon", self.upload_rgba_texture(img_data, 20, 20))
             except Exception as e:
-                print(f"Failed to load play icon: {e}")
-        
-        # Load pause icon
-        pause_icon_path = resource_path(os.path.join("icons", "pause.ico"))
-        if os.path.exists(pause_icon_path):
-            try:
-                img = Image.open(pause_icon_path)
-                if img.mode != "RGBA":
-                    img = img.convert("RGBA")
-                img = img.resize((20, 20), Image.Resampling.LANCZOS)
-                width, height = img.size
-                img_data = img.tobytes()
-                
-                texture = gl.glGenTextures(1)
-                gl.glBindTexture(gl.GL_TEXTURE_2D, texture)
-                gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MIN_FILTER, gl.GL_LINEAR)
-                gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MAG_FILTER, gl.GL_LINEAR)
-                gl.glTexImage2D(gl.GL_TEXTURE_2D, 0, gl.GL_RGBA, width, height,
-                               0, gl.GL_RGBA, gl.GL_UNSIGNED_BYTE, img_data)
-                
-                self.pause_icon = texture
-            except Exception as e:
-                print(f"Failed to load pause icon: {e}")
+                print(f"Failed to load {icon_name} icon: {e}")
     
     def render_title_bar(self):
         """Render custom title bar"""
@@ -1860,10 +2315,7 @@ class SoundsManagerApp:
         imgui.push_style_var(imgui.STYLE_WINDOW_BORDERSIZE, 0.0)
         
         # Darker title bar
-        theme = self.theme_manager.get_theme()
-        r, g, b, a = theme['window_bg']
-        title_bg = (r * 0.8, g * 0.8, b * 0.8, a)
-        imgui.push_style_color(imgui.COLOR_WINDOW_BACKGROUND, *title_bg)
+        imgui.push_style_color(imgui.COLOR_WINDOW_BACKGROUND, *self.title_bar_bg)
         
         flags = (
             imgui.WINDOW_NO_TITLE_BAR |
@@ -1879,15 +2331,11 @@ class SoundsManagerApp:
             imgui.image(self.title_icon, 16, 16)
             imgui.same_line(spacing=4)
         
-        # Title text with theme color
-        theme = self.theme_manager.get_theme()
-        text_color = theme['text']
-        imgui.push_style_color(imgui.COLOR_TEXT, *text_color)
+        # Title text (COLOR_TEXT is already the theme's text color)
         imgui.text("CS2 Sounds Manager")
-        imgui.pop_style_color(1)
         
         # Get the position for the buttons (right side)
-        button_size = 20
+        button_size = TITLE_BUTTON_SIZE
         button_spacing = 4
         total_button_width = (button_size * 2) + button_spacing  # Minimize + Close
         
@@ -1897,10 +2345,7 @@ class SoundsManagerApp:
         imgui.push_style_var(imgui.STYLE_FRAME_ROUNDING, 0.0)
         
         # Minimize button (VS Code style)
-        imgui.push_style_color(imgui.COLOR_BUTTON, 0.0, 0.0, 0.0, 0.0)  # Transparent
-        imgui.push_style_color(imgui.COLOR_BUTTON_HOVERED, 0.2, 0.2, 0.2, 1.0)  # Dark gray
-        imgui.push_style_color(imgui.COLOR_BUTTON_ACTIVE, 0.15, 0.15, 0.15, 1.0)
-        imgui.push_style_color(imgui.COLOR_BORDER, 0.0, 0.0, 0.0, 0.0)  # No border
+        push_style_colors(MINIMIZE_BUTTON_COLORS)
         
         minimize_clicked = imgui.button("##minimize", width=button_size, height=button_size)
         
@@ -1909,14 +2354,11 @@ class SoundsManagerApp:
         draw_list = imgui.get_window_draw_list()
         
         # Draw a centered horizontal line for minimize
-        line_width = 8
-        line_height = 1
-        line_x = min_button_min.x + (button_size - line_width) // 2
-        line_y = min_button_min.y + (button_size - line_height) // 2
-        line_color = imgui.get_color_u32_rgba(0.8, 0.8, 0.8, 1.0)
-        draw_list.add_rect_filled(line_x, line_y, line_x + line_width, line_y + line_height + 1, line_color)
+        x0, y0, x1, y1 = MINIMIZE_GLYPH_RECT
+        draw_list.add_rect_filled(min_button_min.x + x0, min_button_min.y + y0,
+                                  min_button_min.x + x1, min_button_min.y + y1, self.title_glyph_color)
         
-        imgui.pop_style_color(4)
+        imgui.pop_style_color(len(MINIMIZE_BUTTON_COLORS))
         
         if minimize_clicked:
             glfw.iconify_window(self.window)
@@ -1924,35 +2366,21 @@ class SoundsManagerApp:
         imgui.same_line(spacing=button_spacing)
         
         # Close button (VS Code style - red hover)
-        imgui.push_style_color(imgui.COLOR_BUTTON, 0.0, 0.0, 0.0, 0.0)  # Transparent
-        imgui.push_style_color(imgui.COLOR_BUTTON_HOVERED, 0.9, 0.2, 0.2, 1.0)  # Red
-        imgui.push_style_color(imgui.COLOR_BUTTON_ACTIVE, 0.8, 0.15, 0.15, 1.0)
-        imgui.push_style_color(imgui.COLOR_BORDER, 0.0, 0.0, 0.0, 0.0)  # No border
+        push_style_colors(CLOSE_BUTTON_COLORS)
         
         close_clicked = imgui.button("##close", width=button_size, height=button_size)
         
         # Draw centered X symbol manually
         close_button_min = imgui.get_item_rect_min()
         
-        # Calculate center of button
-        center_x = close_button_min.x + button_size // 2
-        center_y = close_button_min.y + button_size // 2
-        
         # Draw X with two lines
-        x_size = 6
-        text_color = imgui.get_color_u32_rgba(0.8, 0.8, 0.8, 1.0)
-        draw_list.add_line(
-            center_x - x_size // 2, center_y - x_size // 2,
-            center_x + x_size // 2, center_y + x_size // 2,
-            text_color, 1.5
-        )
-        draw_list.add_line(
-            center_x + x_size // 2, center_y - x_size // 2,
-            center_x - x_size // 2, center_y + x_size // 2,
-            text_color, 1.5
-        )
+        x0, y0, x1, y1 = CLOSE_GLYPH_RECT
+        left, top = close_button_min.x + x0, close_button_min.y + y0
+        right, bottom = close_button_min.x + x1, close_button_min.y + y1
+        draw_list.add_line(left, top, right, bottom, self.title_glyph_color, 1.5)
+        draw_list.add_line(right, top, left, bottom, self.title_glyph_color, 1.5)
         
-        imgui.pop_style_color(4)
+        imgui.pop_style_color(len(CLOSE_BUTTON_COLORS))
         
         if close_clicked:
             glfw.set_window_should_close(self.window, True)
@@ -1964,7 +2392,6 @@ class SoundsManagerApp:
         if imgui.is_window_hovered() and imgui.is_mouse_clicked(0):
             self.dragging_window = True
             mouse_x, mouse_y = glfw.get_cursor_pos(self.window)
-            win_x, win_y = glfw.get_window_pos(self.window)
             self.drag_offset_x = mouse_x
             self.drag_offset_y = mouse_y
         
@@ -1974,6 +2401,8 @@ class SoundsManagerApp:
     
     def render_main_window(self):
         """Render main application window with two-panel layout"""
+        theme = self.theme_manager.get_theme()  # Looked up once per frame, shared by all panels
+        
         # Left Panel - File Selection (leave room for bottom button bar)
         button_bar_height = 60
         imgui.set_next_window_position(0, CUSTOM_TITLE_BAR_HEIGHT)
@@ -2039,12 +2468,8 @@ class SoundsManagerApp:
         
         # Show dropdown with available addons
         if self.show_addon_dropdown and len(self.filtered_addons) > 0:
-            # Get current theme colors
-            theme = self.theme_manager.get_theme()
-            
-            # Use theme colors for dropdown
+            # Use theme colors for dropdown (border and button colors already come from the theme style)
             imgui.push_style_color(imgui.COLOR_CHILD_BACKGROUND, *theme['window_bg'])
-            imgui.push_style_color(imgui.COLOR_BORDER, *theme['border'])
             imgui.push_style_var(imgui.STYLE_CHILD_ROUNDING, 4.0)
             imgui.push_style_var(imgui.STYLE_CHILD_BORDERSIZE, 1.0)
             
@@ -2070,14 +2495,9 @@ class SoundsManagerApp:
             for i, addon in enumerate(self.filtered_addons):
                 is_selected = (i == self.selected_addon_index)
                 
-                # Highlight selected item with theme colors
+                # Highlight selected item with theme colors, the others use the style's theme button colors
                 if is_selected:
                     imgui.push_style_color(imgui.COLOR_BUTTON, *theme['button_active'])
-                else:
-                    imgui.push_style_color(imgui.COLOR_BUTTON, *theme['button'])
-                
-                imgui.push_style_color(imgui.COLOR_BUTTON_HOVERED, *theme['button_hover'])
-                imgui.push_style_color(imgui.COLOR_BUTTON_ACTIVE, *theme['button_active'])
                 
                 if imgui.button(addon, width=-1, height=item_height):
                     print(f"DEBUG: Selected addon: '{addon}'")
@@ -2089,11 +2509,12 @@ class SoundsManagerApp:
                     self.filtered_addons = []
                     self.addon_just_selected = True  # Flag to force input update next frame
                 
-                imgui.pop_style_color(3)
+                if is_selected:
+                    imgui.pop_style_color()
             
             imgui.end_child()
             imgui.pop_style_var(2)
-            imgui.pop_style_color(2)
+            imgui.pop_style_color(1)
         
         imgui.spacing()
         imgui.separator()
@@ -2238,7 +2659,7 @@ class SoundsManagerApp:
                     1.0, 
                     "%.2f"
                 )
-                if changed:
+                if changed and pygame and pygame.mixer.get_init():
                     pygame.mixer.music.set_volume(self.preview_volume)
                 
                 imgui.spacing()
@@ -2247,15 +2668,12 @@ class SoundsManagerApp:
             imgui.text("Search:")
             
             if self.loading_internal_sounds:
-                imgui.text_colored("Loading...", 1.0, 1.0, 0.0)
+                imgui.text_colored("Loading...", *STATUS_YELLOW)
             elif not self.internal_sounds_loaded:
                 imgui.text_colored("Click 'Load Sounds' to browse", 1.0, 0.5, 0.0)
                 if imgui.button("Load Sounds", width=-1, height=30):
                     self.load_internal_sounds()
             else:
-                # Get current theme colors
-                theme = self.theme_manager.get_theme()
-                
                 # Filter input
                 changed, self.internal_sound_filter = imgui.input_text("##internal_filter", self.internal_sound_filter, 256)
                 if changed:
@@ -2266,70 +2684,66 @@ class SoundsManagerApp:
                 # Sound list in scrollable child window with tree structure
                 imgui.begin_child("##internal_sounds_list", 0, 250, border=True)
                 
-                # Build tree structure from filtered sounds
-                tree = {}
-                for sound in self.filtered_internal_sounds:
-                    parts = sound.split('/')
-                    current = tree
-                    for part in parts[:-1]:  # All but the last (filename)
-                        if part not in current:
-                            current[part] = {}
-                        current = current[part]
-                    # Add filename
-                    if '__files__' not in current:
-                        current['__files__'] = []
-                    current['__files__'].append(sound)
-                
-                # Render tree recursively
-                def render_tree(node, path=""):
-                    # Render folders first
-                    for folder_name in sorted([k for k in node.keys() if k != '__files__']):
-                        folder_path = f"{path}/{folder_name}" if path else folder_name
-                        
-                        imgui.push_style_color(imgui.COLOR_HEADER_HOVERED, *theme['button_hover'])
-                        imgui.push_style_color(imgui.COLOR_HEADER_ACTIVE, *theme['button_active'])
-                        imgui.push_style_color(imgui.COLOR_HEADER, *theme['button'])
-                        
-                        # Tree node for folder
-                        opened = imgui.tree_node(f"{folder_name}###{folder_path}")
-                        
-                        imgui.pop_style_color(3)
+                # The open part of the tree is kept as flat rows, rebuilt when the filter or a folder changes
+                if self.flat_tree_source is not self.filtered_internal_sounds_tree:
+                    self.rebuild_flat_tree_rows()
+                
+                # Header colors are the same for every folder and file, push them once
+                imgui.push_style_color(imgui.COLOR_HEADER_HOVERED, *theme['button_hover'])
+                imgui.push_style_color(imgui.COLOR_HEADER_ACTIVE, *theme['button_active'])
+                imgui.push_style_color(imgui.COLOR_HEADER, *theme['button'])
+                
+                # Only the rows scrolled into view are submitted
+                indent_spacing = imgui.get_style().indent_spacing
+                toggled_folder = None
+                clipper = imgui.ListClipper()
+                clipper.begin(len(self.flat_tree_rows))
+                while clipper.step():
+                    for i in range(clipper.display_start, clipper.display_end):
+                        depth, folder_path, label, file_row = self.flat_tree_rows[i]
+                        if depth:
+                            imgui.indent(depth * indent_spacing)
                         
-                        if opened:
-                            render_tree(node[folder_name], folder_path)
-                            imgui.tree_pop()
-                    
-                    # Render files in this folder
-                    if '__files__' in node:
-                        for sound in sorted(node['__files__']):
+                        if folder_path is not None:
+                            # Open state lives in folder_open, ImGui only draws the arrow and reports clicks
+                            is_open = self.folder_open.get(folder_path, False)
+                            imgui.set_next_item_open(is_open)
+                            if imgui.tree_node(label, imgui.TREE_NODE_NO_TREE_PUSH_ON_OPEN) != is_open:
+                                toggled_folder = folder_path
+                        else:
+                            sound, display_name = file_row
                             is_selected = (sound == self.selected_internal_sound)
-                            display_name = os.path.basename(sound)
-                            
-                            imgui.push_style_color(imgui.COLOR_HEADER_HOVERED, *theme['button_hover'])
-                            imgui.push_style_color(imgui.COLOR_HEADER_ACTIVE, *theme['button_active'])
                             
+                            # Only the selected row differs from the colors pushed for the whole tree
                             if is_selected:
                                 imgui.push_style_color(imgui.COLOR_HEADER, *theme['button_active'])
-                            else:
-                                imgui.push_style_color(imgui.COLOR_HEADER, *theme['button'])
                             
-                            clicked, _ = imgui.selectable(f"  {display_name}###{sound}", is_selected)
+                            clicked, _ = imgui.selectable(label, is_selected)
+                            
+                            if is_selected:
+                                imgui.pop_style_color()
+                            
                             if clicked:
                                 self.selected_internal_sound = sound
                                 self.sound_name = display_name
                                 self.output_name = display_name
                                 self.preview_internal_sound()
-                            
-                            imgui.pop_style_color(3)
+                        
+                        if depth:
+                            imgui.unindent(depth * indent_spacing)
+                clipper.end()
+                imgui.pop_style_color(3)
                 
-                render_tree(tree)
+                if toggled_folder is not None:
+                    self.folder_open[toggled_folder] = not self.folder_open.get(toggled_folder, False)
+                    self.rebuild_flat_tree_rows()
                 
                 imgui.end_child()
                 
                 # Show selected sound (also just filename)
                 if self.selected_internal_sound:
                     imgui.spacing()
-                    imgui.text_colored("Selected:", 0.0, 1.0, 0.0)
+                    imgui.text_colored("Selected:", *STATUS_GREEN)
                     imgui.push_text_wrap_pos(self.left_panel_width - 28)
                     imgui.text(os.path.basename(self.selected_internal_sound))
                     imgui.pop_text_wrap_pos()
@@ -2367,7 +2781,7 @@ class SoundsManagerApp:
                     1.0, 
                     "%.2f"
                 )
-                if changed:
+                if changed and pygame and pygame.mixer.get_init():
                     pygame.mixer.music.set_volume(self.preview_volume)
                 
                 imgui.spacing()
@@ -2936,26 +3350,22 @@ class SoundsManagerApp:
         imgui.set_cursor_pos_x(self.window_width - total_button_width - 14)
         
         # Open Folder button (Yellow)
-        imgui.push_style_color(imgui.COLOR_BUTTON, 0.8, 0.7, 0.2, 1.0)  # Yellow
-        imgui.push_style_color(imgui.COLOR_BUTTON_HOVERED, 0.9, 0.8, 0.3, 1.0)
-        imgui.push_style_color(imgui.COLOR_BUTTON_ACTIVE, 0.7, 0.6, 0.15, 1.0)
+        push_style_colors(OPEN_FOLDER_BUTTON_COLORS)
         
         if imgui.button("Open Folder", width=button_width, height=40):
             self.open_addon_sounds_folder()
         
-        imgui.pop_style_color(3)
+        imgui.pop_style_color(len(OPEN_FOLDER_BUTTON_COLORS))
         
         imgui.same_line(spacing=button_spacing)
         
         # Add Sound button (Green)
-        imgui.push_style_color(imgui.COLOR_BUTTON, 0.2, 0.7, 0.3, 1.0)  # Green
-        imgui.push_style_color(imgui.COLOR_BUTTON_HOVERED, 0.3, 0.8, 0.4, 1.0)
-        imgui.push_style_color(imgui.COLOR_BUTTON_ACTIVE, 0.15, 0.6, 0.25, 1.0)
+        push_style_colors(ADD_SOUND_BUTTON_COLORS)
         
         if imgui.button("Add Sound", width=button_width, height=40):
             self.add_sound()
         
-        imgui.pop_style_color(3)
+        imgui.pop_style_color(len(ADD_SOUND_BUTTON_COLORS))
         
         imgui.end()
         imgui.pop_style_var(2)
@@ -2983,6 +3393,10 @@ class SoundsManagerApp:
         # Checkbox colors (match theme)
         style.colors[imgui.COLOR_CHECK_MARK] = theme['button_active']
         
+        # Darker title bar, derived once per theme instead of every frame
+        r, g, b, a = theme['window_bg']
+        self.title_bar_bg = (r * 0.8, g * 0.8, b * 0.8, a)
+        
         # No need to reload font as we always use Consolas now
         new_theme_name = self.theme_manager.get_theme_name()
         self.current_theme_name = new_theme_name
@@ -3167,23 +3581,23 @@ class SoundsManagerApp:
         # Far label
         far_label_y = center_y - far_radius - 20
         imgui.set_cursor_screen_pos((center_x - 80, far_label_y))
-        imgui.text_colored(f"Far: {self.distance_far:.0f} units", 1.0, 1.0, 1.0, 1.0)
+        imgui.text_colored(f"Far: {self.distance_far:.0f} units", *STATUS_WHITE)
         imgui.same_line()
-        imgui.text_colored(f"Vol: {self.distance_far_volume:.1f}", 1.0, 1.0, 1.0, 1.0)
+        imgui.text_colored(f"Vol: {self.distance_far_volume:.1f}", *STATUS_WHITE)
         
         # Mid label
         mid_label_y = center_y - mid_radius - 20
         imgui.set_cursor_screen_pos((center_x - 80, mid_label_y))
-        imgui.text_colored(f"Mid: {self.distance_mid:.0f} units", 1.0, 1.0, 1.0, 1.0)
+        imgui.text_colored(f"Mid: {self.distance_mid:.0f} units", *STATUS_WHITE)
         imgui.same_line()
-        imgui.text_colored(f"Vol: {self.distance_mid_volume:.1f}", 1.0, 1.0, 1.0, 1.0)
+        imgui.text_colored(f"Vol: {self.distance_mid_volume:.1f}", *STATUS_WHITE)
         
         # Near label
         near_label_y = center_y - near_radius - 20
         imgui.set_cursor_screen_pos((center_x - 80, near_label_y))
-        imgui.text_colored(f"Near: {self.distance_near:.0f} units", 1.0, 1.0, 1.0, 1.0)
+        imgui.text_colored(f"Near: {self.distance_near:.0f} units", *STATUS_WHITE)
         imgui.same_line()
-        imgui.text_colored(f"Vol: {self.distance_near_volume:.1f}", 1.0, 1.0, 1.0, 1.0)
+        imgui.text_colored(f"Vol: {self.distance_near_volume:.1f}", *STATUS_WHITE)
         
         # Check for mouse hover on intermediate circles and show tooltips
         mouse_pos = imgui.get_mouse_pos()
@@ -3207,6 +3621,29 @@ class SoundsManagerApp:
                 tooltip_shown = True
                 break
     
+    def build_waveform_points(self, timeline_x, timeline_y, width, height):
+        """Top and bottom envelope polyline points for the waveform at the given timeline rectangle"""
+        center_y = timeline_y + height / 2
+        waveform_height = height * 0.85  # Use more of the height
+        
+        # Find maximum amplitude to normalize the waveform
+        max_amplitude = max(self.audio_waveform) if self.audio_waveform else 1.0
+        max_amplitude = max(max_amplitude, 0.01)  # Avoid division by zero
+        
+        # Two polylines along the bar tops and bottoms instead of one add_line per bar; a single
+        # zig-zag would reverse at every vertex and ImGui's clamped miters spike each bar tip
+        x_step = width / len(self.audio_waveform)
+        # Normalize amplitude so the highest peak fills the available height
+        height_scale = waveform_height / 2 / max_amplitude
+        top_points = []
+        bottom_points = []
+        for i, amplitude in enumerate(self.audio_waveform):
+            x = timeline_x + i * x_step
+            bar_height = amplitude * height_scale
+            top_points.append((x, center_y - bar_height))
+            bottom_points.append((x, center_y + bar_height))
+        return top_points, bottom_points
+    
     def render_audio_timeline(self):
         """Render audio timeline with waveform, loop markers, and playback position"""
         if self.audio_duration_ms == 0:
@@ -3235,19 +3672,14 @@ class SoundsManagerApp:
         # Draw waveform
         if len(self.audio_waveform) > 0:
             waveform_color = imgui.get_color_u32_rgba(0.3, 0.5, 0.7, 0.8)
-            center_y = timeline_y + height / 2
-            waveform_height = height * 0.85  # Use more of the height
-            
-            # Find maximum amplitude to normalize the waveform
-            max_amplitude = max(self.audio_waveform) if self.audio_waveform else 1.0
-            max_amplitude = max(max_amplitude, 0.01)  # Avoid division by zero
-            
-            for i, amplitude in enumerate(self.audio_waveform):
-                x = timeline_x + (i / len(self.audio_waveform)) * width
-                # Normalize amplitude so the highest peak fills the available height
-                normalized_amplitude = amplitude / max_amplitude
-                bar_height = normalized_amplitude * waveform_height / 2
-                draw_list.add_line(x, center_y - bar_height, x, center_y + bar_height, waveform_color, 1.5)
+            # Points only change with a new waveform or when the timeline moves on screen
+            points_origin = (timeline_x, timeline_y, width, height)
+            if self.waveform_dirty or points_origin != self.waveform_points_origin:
+                self.waveform_points = self.build_waveform_points(timeline_x, timeline_y, width, height)
+                self.waveform_points_origin = points_origin
+                self.waveform_dirty = False
+            for envelope in self.waveform_points:
+                draw_list.add_polyline(envelope, waveform_color, thickness=1.5)
         
         # Draw loop region if enabled
         if self.encoding_loop_enabled and self.audio_duration_ms > 0:
@@ -3344,7 +3776,7 @@ class SoundsManagerApp:
             loop_start_sec = self.encoding_loop_start_ms / 1000.0
             loop_end_sec = self.encoding_loop_end_ms / 1000.0
             imgui.set_cursor_screen_pos((timeline_x, timeline_y + height + 20))
-            imgui.text_colored(f"Loop: {loop_start_sec:.2f}s - {loop_end_sec:.2f}s", 0.0, 1.0, 0.0, 1.0)
+            imgui.text_colored(f"Loop: {loop_start_sec:.2f}s - {loop_end_sec:.2f}s", *STATUS_GREEN)
         
         # Reserve space for the timeline
         imgui.dummy(width, height + 35)
@@ -3423,7 +3855,7 @@ class SoundsManagerApp:
                 dll_path = os.path.join(self.cs2_basefolder, 'game', 'bin', 'win64', 'lame_enc.dll')
                 if os.path.exists(dll_path):
                     imgui.same_line()
-                    imgui.text_colored("(lame_enc.dll: OK)", 0.0, 1.0, 0.0, 1.0)
+                    imgui.text_colored("(lame_enc.dll: OK)", *STATUS_GREEN)
                 else:
                     imgui.same_line()
                     imgui.text_colored("(lame_enc.dll: will download)", 1.0, 0.8, 0.0, 1.0)
@@ -3653,8 +4085,8 @@ class SoundsManagerApp:
                     imgui.text_colored("(i) Internal sounds as MP3 (limited loop support)", 0.8, 0.8, 0.0, 1.0)
                     
                     # Show ffmpeg download button
-                    if self.ffmpeg_path and os.path.exists(self.ffmpeg_path):
-                        imgui.text_colored("ffmpeg + ffprobe available", 0.0, 1.0, 0.0, 1.0)
+                    if self.ffmpeg_path:
+                        imgui.text_colored("ffmpeg + ffprobe available", *STATUS_GREEN)
                         imgui.same_line()
                         if imgui.button("Open Folder", width=100, height=25):
                             ffmpeg_dir = os.path.dirname(self.ffmpeg_path)
@@ -3664,7 +4096,7 @@ class SoundsManagerApp:
                             imgui.text("Open ffmpeg installation folder")
                             imgui.end_tooltip()
                     elif self.downloading_ffmpeg:
-                        imgui.text_colored("⏳ Downloading ffmpeg + ffprobe...", 1.0, 1.0, 0.0, 1.0)
+                        imgui.text_colored(f"⏳ Downloading ffmpeg + ffprobe... {self.ffmpeg_download_progress}%", *STATUS_YELLOW)
                     else:
                         if imgui.button("Download ffmpeg + ffprobe for loop extraction", width=290, height=25):
                             self.download_ffmpeg()
@@ -3686,35 +4118,83 @@ class SoundsManagerApp:
         """Main application loop"""
         self.init_window()
         
+        last_frame_time = 0.0
         while not glfw.window_should_close(self.window):
-            glfw.poll_events()
+            # Nothing to draw while minimized/hidden - block until the window changes state
+            if (glfw.get_window_attrib(self.window, glfw.ICONIFIED)
+                    or not glfw.get_window_attrib(self.window, glfw.VISIBLE)):
+                glfw.wait_events()
+                self.process_ui_queue()
+                continue
+            
+            # Frame cap - sleep before polling so the next frame uses fresh input
+            frame_elapsed = time.perf_counter() - last_frame_time
+            if frame_elapsed < MIN_FRAME_TIME:
+                time.sleep(MIN_FRAME_TIME - frame_elapsed)
+            last_frame_time = time.perf_counter()
+            
+            # Block until input arrives instead of busy-polling every frame
+            # (window dragging is handled directly in the cursor position callback)
+            if self.needs_fast_refresh():
+                glfw.wait_events_timeout(ACTIVE_EVENT_TIMEOUT)
+            else:
+                glfw.wait_events_timeout(IDLE_EVENT_TIMEOUT)
             self.impl.process_inputs()
             
+            # Apply results posted by worker threads
+            if self.process_ui_queue():
+                self.input_received = True
+            
+            # A preview finished preparing on its worker thread, play it here (mixer is UI-thread only)
+            if self.pending_preview:
+                self.start_pending_preview()
+            
+            # A worker needed ffmpeg, start the download here so the in-progress check can't race
+            if self.ffmpeg_download_requested:
+                self.ffmpeg_download_requested = False
+                self.download_ffmpeg()
+            
+            # A background analysis finished, show it on the timeline
+            if self.analysis_future and self.analysis_future.done():
+                future, self.analysis_future = self.analysis_future, None
+                self.apply_audio_analysis(self.analysis_key, future.result())
+                self.input_received = True
+            
             # Check for theme updates
             if self.theme_manager.check_for_updates():
                 self.reapply_theme()
-            
-            # Handle window dragging
-            if self.dragging_window:
-                if glfw.get_mouse_button(self.window, glfw.MOUSE_BUTTON_LEFT) == glfw.PRESS:
-                    mouse_x, mouse_y = glfw.get_cursor_pos(self.window)
-                    win_x, win_y = glfw.get_window_pos(self.window)
-                    new_x = int(win_x + mouse_x - self.drag_offset_x)
-                    new_y = int(win_y + mouse_y - self.drag_offset_y)
-                    glfw.set_window_pos(self.window, new_x, new_y)
-                else:
-                    self.dragging_window = False
+                self.input_received = True
+            
+            # Repaint requested by the OS with nothing changed - replay the previous
+            # frame's draw data instead of rebuilding the whole widget tree
+            if (self.window_refresh_requested and not self.input_received
+                    and not self.dragging_window and not self.needs_fast_refresh()):
+                self.window_refresh_requested = False
+                gl.glClearColor(0.1, 0.1, 0.1, 1.0)
+                gl.glClear(gl.GL_COLOR_BUFFER_BIT)
+                self.impl.render(imgui.get_draw_data())
+                glfw.swap_buffers(self.window)
+                continue
+            
+            # Idle wakeup with no input, worker results or animation - the last frame is still correct
+            if self.input_received:
+                self.dirty_frames_remaining = REDRAW_FRAMES_AFTER_CHANGE
+            elif self.dirty_frames_remaining <= 0 and not self.dragging_window and not self.needs_fast_refresh():
+                continue
+            self.dirty_frames_remaining -= 1
+            self.input_received = False
+            self.window_refresh_requested = False
             
             imgui.new_frame()
             
             self.render_title_bar()
             self.render_main_window()
             
-            # Set cursor to pointer when hovering over clickable items
-            if imgui.is_any_item_hovered():
-                glfw.set_cursor(self.window, self.hand_cursor)
-            else:
-                glfw.set_cursor(self.window, self.arrow_cursor)
+            # Set cursor to pointer when hovering over clickable items (only when it changes)
+            desired_cursor = self.hand_cursor if imgui.is_any_item_hovered() else self.arrow_cursor
+            if desired_cursor is not self.current_cursor:
+                glfw.set_cursor(self.window, desired_cursor)
+                self.current_cursor = desired_cursor
             
             gl.glClearColor(0.1, 0.1, 0.1, 1.0)
             gl.glClear(gl.GL_COLOR_BUFFER_BIT)
@@ -3723,6 +4203,25 @@ class SoundsManagerApp:
             self.impl.render(imgui.get_draw_data())
             glfw.swap_buffers(self.window)
         
+        # Workers still running call log() -> wake_ui(), which must not post events once glfw is torn down
+        self.window = None
+        if self.tk_root is not None:
+            self.tk_root.destroy()
+        self.worker_pool.shutdown(wait=False, cancel_futures=True)
+        
+        # Release the pak01_dir.vpk handle the decompiler keeps open (waits for a running decompile)
+        if self.vsnd_decompiler:
+            with self.vsnd_decompiler.lock:
+                self.vsnd_decompiler.close()
+        
+        # Remove the rendered loop preview (kept between plays while the app runs)
+        if self.temp_loop_file and os.path.exists(self.temp_loop_file):
+            try:
+                if pygame and pygame.mixer.get_init():
+                    pygame.mixer.music.unload()
+                os.remove(self.temp_loop_file)
+            except Exception:
+                pass
         self.impl.shutdown()
         glfw.terminate()
 
@@ -7,6 +7,7 @@ Uses .NET Core runtime (like Hammer5Tools)
 import os
 import sys
 import tempfile
+import threading
 import urllib.request
 from pathlib import Path
 
@@ -29,6 +30,12 @@ class VSNDDecompiler:
         self.Resource = None
         self.FileExtract = None
         self.Package = None
+        self.read_entry_method = None
+        self.extract_method = None
+        # Opened VPK kept across previews (re-reading the directory tree is the slow part)
+        self.package = None
+        self.package_path = None
+        self.lock = threading.Lock()
         
     def ensure_dlls(self):
         """Download DLLs if they don't exist"""
@@ -95,6 +102,17 @@ class VSNDDecompiler:
                 print("✗ Could not find required .NET types")
                 return False
             
+            # Look up the reflected methods once instead of on every decompile
+            from System.Reflection import BindingFlags
+            for method in self.Package.GetMethods(BindingFlags.Public | BindingFlags.Instance):
+                if method.Name == "ReadEntry" and len(method.GetParameters()) >= 2:
+                    self.read_entry_method = method
+                    break
+            for method in self.FileExtract.GetMethods(BindingFlags.Public | BindingFlags.Static):
+                if method.Name == "Extract":
+                    self.extract_method = method
+                    break
+            
             self.initialized = True
             print("✓ VSND decompiler initialized with .NET Core")
             return True
@@ -130,119 +148,118 @@ class VSNDDecompiler:
         if not self.initialized and not self.initialize():
             return None
         
+        with self.lock:
+            return self._decompile(vpk_path, internal_sound_path, output_path)
+    
+    def get_package(self, vpk_path):
+        """Return the opened VPK package, only re-reading it when a different VPK is requested"""
+        import System
+        
+        if self.package is not None and self.package_path == vpk_path:
+            return self.package
+        
+        self.close()
+        package = System.Activator.CreateInstance(self.Package)
+        package.Read(vpk_path)
+        self.package = package
+        self.package_path = vpk_path
+        return package
+    
+    def close(self):
+        """Dispose the cached VPK package"""
+        if self.package is not None and hasattr(self.package, 'Dispose'):
+            self.package.Dispose()
+        self.package = None
+        self.package_path = None
+    
+    def _decompile(self, vpk_path, internal_sound_path, output_path):
         try:
             import System
-            from System.IO import MemoryStream
-            from System import Array, Byte
-            from System.Reflection import BindingFlags
+            from System.IO import MemoryStream, File
+            from System import Byte
+            
+            # Open VPK (cached) and extract file
+            package = self.get_package(vpk_path)
+            
+            # Normalize path - VPK uses forward slashes
+            normalized_path = internal_sound_path.replace("\\", "/")
+            file_entry = package.FindEntry(normalized_path)
+            
+            if not file_entry:
+                print(f"✗ File not found in VPK: {normalized_path}")
+                print(f"  Tried path: {normalized_path}")
+                return None
+            
+            read_method = self.read_entry_method
+            if not read_method:
+                print("✗ Could not find ReadEntry method")
+                return None
+            
+            # Invoke ReadEntry to get file data
+            params = read_method.GetParameters()
+            args = System.Array.CreateInstance(System.Object, len(params))
+            args[0] = file_entry
+            args[1] = System.Array.CreateInstance(Byte, 0)
+            if len(params) > 2:
+                args[2] = True  # validateCrc
+            
+            read_method.Invoke(package, args)
+            data = args[1]  # out parameter contains the data (stays a .NET byte[], no copy into Python)
+            
+            # Create resource and load data
+            resource = System.Activator.CreateInstance(self.Resource)
+            memory_stream = MemoryStream(data)
             
-            # Open VPK and extract file
-            package = System.Activator.CreateInstance(self.Package)
             try:
-                package.Read(vpk_path)
+                resource.Read(memory_stream)
                 
-                # Normalize path - VPK uses forward slashes
-                normalized_path = internal_sound_path.replace("\\", "/")
-                file_entry = package.FindEntry(normalized_path)
-                
-                if not file_entry:
-                    print(f"✗ File not found in VPK: {normalized_path}")
-                    print(f"  Tried path: {normalized_path}")
-                    return None
-                
-                # Find ReadEntry method
-                read_method = None
-                methods = self.Package.GetMethods(BindingFlags.Public | BindingFlags.Instance)
-                for method in methods:
-                    if method.Name == "ReadEntry":
-                        params = method.GetParameters()
-                        if len(params) >= 2:
-                            read_method = method
-                            break
-                
-                if not read_method:
-                    print("✗ Could not find ReadEntry method")
+                # Extract method (static method on FileExtract)
+                extract_method = self.extract_method
+                if not extract_method:
+                    print("✗ Could not find FileExtract.Extract method")
                     return None
                 
-                # Invoke ReadEntry to get file data
-                params = read_method.GetParameters()
-                args = System.Array.CreateInstance(System.Object, len(params))
-                args[0] = file_entry
-                args[1] = System.Array.CreateInstance(Byte, 0)
-                if len(params) > 2:
-                    args[2] = True  # validateCrc
+                # Invoke Extract (static method)
+                extract_params = extract_method.GetParameters()
+                extract_args = System.Array.CreateInstance(System.Object, len(extract_params))
+                extract_args[0] = resource
+                for i in range(1, len(extract_params)):
+                    extract_args[i] = None
                 
-                read_method.Invoke(package, args)
-                data = args[1]  # out parameter contains the data
+                content_file = extract_method.Invoke(None, extract_args)
                 
-                # Convert to Python bytes if needed
-                if not isinstance(data, bytes):
-                    data = bytes([data[i] for i in range(data.Length)])
-                
-                # Create resource and load data
-                resource = System.Activator.CreateInstance(self.Resource)
-                memory_stream = MemoryStream(data)
-                
-                try:
-                    resource.Read(memory_stream)
-                    
-                    # Find Extract method (static method on FileExtract)
-                    extract_method = None
-                    methods = self.FileExtract.GetMethods(BindingFlags.Public | BindingFlags.Static)
-                    for method in methods:
-                        if method.Name == "Extract":
-                            extract_method = method
-                            break
+                if content_file and hasattr(content_file, 'Data') and content_file.Data:
+                    # Determine output format
+                    ext = 'wav'
+                    if hasattr(content_file, 'FileName') and content_file.FileName:
+                        file_ext = os.path.splitext(str(content_file.FileName))[1][1:]
+                        if file_ext:
+                            ext = file_ext
+                    elif hasattr(content_file, 'Type') and str(content_file.Type).lower() == 'mp3':
+                        ext = 'mp3'
                     
-                    if not extract_method:
-                        print("✗ Could not find FileExtract.Extract method")
-                        return None
+                    # Save file (written from .NET directly instead of copying byte by byte into Python)
+                    output_file = output_path.replace('.wav', f'.{ext}').replace('.mp3', f'.{ext}')
+                    os.makedirs(os.path.dirname(output_file), exist_ok=True)
+                    File.WriteAllBytes(output_file, content_file.Data)
                     
-                    # Invoke Extract (static method)
-                    extract_params = extract_method.GetParameters()
-                    extract_args = System.Array.CreateInstance(System.Object, len(extract_params))
-                    extract_args[0] = resource
-                    for i in range(1, len(extract_params)):
-                        extract_args[i] = None
-                    
-                    content_file = extract_method.Invoke(None, extract_args)
-                    
-                    if content_file and hasattr(content_file, 'Data') and content_file.Data:
-                        # Determine output format
-                        ext = 'wav'
-                        if hasattr(content_file, 'FileName') and content_file.FileName:
-                            file_ext = os.path.splitext(str(content_file.FileName))[1][1:]
-                            if file_ext:
-                                ext = file_ext
-                        elif hasattr(content_file, 'Type') and str(content_file.Type).lower() == 'mp3':
-                            ext = 'mp3'
-                        
-                        # Save file
-                        output_file = output_path.replace('.wav', f'.{ext}').replace('.mp3', f'.{ext}')
-                        os.makedirs(os.path.dirname(output_file), exist_ok=True)
-                        
-                        out_bytes = bytes([content_file.Data[i] for i in range(content_file.Data.Length)])
-                        with open(output_file, 'wb') as f:
-                            f.write(out_bytes)
-                        
-                        print(f"✓ Decompiled {internal_sound_path} to {output_file} ({len(out_bytes)} bytes)")
-                        return output_file
-                    else:
-                        print("✗ Failed to extract content from .vsnd_c file")
-                        return None
-                
-                finally:
-                    memory_stream.Dispose()
-                    if hasattr(resource, 'Dispose'):
-                        resource.Dispose()
+                    print(f"✓ Decompiled {internal_sound_path} to {output_file} ({content_file.Data.Length} bytes)")
+                    return output_file
+                else:
+                    print("✗ Failed to extract content from .vsnd_c file")
+                    return None
             
             finally:
-                if hasattr(package, 'Dispose'):
-                    package.Dispose()
-            
-            return None
+                memory_stream.Dispose()
+                if hasattr(resource, 'Dispose'):
+                    resource.Dispose()
             
         except Exception as e:
+            # Drop the cached package, it may be what failed
+            try:
+                self.close()
+            except Exception:
+                pass
             print(f"✗ Error decompiling vsnd: {e}")
             import traceback
             traceback.print_exc()